@@ -0,0 +1,140 @@
+"""
+In-process fake of the Supabase client
+
+Implements the slice of the supabase-py query builder the dashboard uses
+(select / insert with order, limit, range and simple filters) over plain
+lists, seeded with a deterministic history.
+"""
+
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+
+MOODS = ['sad', 'down', 'neutral', 'good', 'happy', 'great']
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """Chainable query over one fake table"""
+
+    def __init__(self, client, table):
+        self._client = client
+        self._table = table
+        self._insert = None
+        self._filters = []
+        self._order = None
+        self._range = None
+
+    def select(self, *columns, **kwargs):
+        return self
+
+    def insert(self, rows):
+        self._insert = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def order(self, column, desc=False):
+        self._order = (column, desc)
+        return self
+
+    def limit(self, count):
+        start = self._range[0] if self._range else 0
+        self._range = (start, start + count - 1)
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end)
+        return self
+
+    def eq(self, column, value):
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self._filters.append(lambda row: row.get(column, 0) > value)
+        return self
+
+    def gte(self, column, value):
+        self._filters.append(lambda row: row.get(column, '') >= value)
+        return self
+
+    def lte(self, column, value):
+        self._filters.append(lambda row: row.get(column, '') <= value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self._filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def execute(self):
+        with self._client.lock:
+            rows = self._client.tables.setdefault(self._table, [])
+            if self._insert is not None:
+                inserted = []
+                for row in self._insert:
+                    self._client.next_id += 1
+                    inserted.append({'id': self._client.next_id, **row})
+                rows.extend(inserted)
+                return FakeResponse(inserted)
+
+            result = [dict(row) for row in rows if all(f(row) for f in self._filters)]
+        if self._order:
+            column, desc = self._order
+            result.sort(key=lambda row: row.get(column) or '', reverse=desc)
+        if self._range:
+            start, end = self._range
+            result = result[start:end + 1]
+        return FakeResponse(result)
+
+
+class FakeSupabase:
+    """Drop-in for supabase.Client backed by in-memory tables"""
+
+    def __init__(self, tables=None):
+        self.tables = tables or {}
+        self.lock = threading.Lock()
+        self.next_id = sum(len(rows) for rows in self.tables.values())
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def seeded_tables(days=90, moods_per_day=3, decisions=200, ideas=200, seed=1):
+    """Deterministic mood/decision/idea history ending now"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    next_id = 0
+
+    def row(**fields):
+        nonlocal next_id
+        next_id += 1
+        return {'id': next_id, **fields}
+
+    def stamp(max_days):
+        return (now - timedelta(minutes=rng.randrange(max_days * 24 * 60))).isoformat()
+
+    mood_entries = [
+        row(mood=rng.choice(MOODS), note=rng.choice(['', 'Slept well', 'Busy day', 'Went to a meeting']),
+            created_at=stamp(days))
+        for _ in range(days * moods_per_day)
+    ]
+    decision_rows = [
+        row(decision=f"Decision {i}: {rng.choice(['start', 'stop', 'keep'])} {rng.choice(['running', 'journaling', 'coffee', 'side project'])}",
+            context=rng.choice(['', 'After talking it over', 'Budget reasons']), created_at=stamp(days))
+        for i in range(decisions)
+    ]
+    idea_rows = [
+        row(idea=f"Idea {i}: {rng.choice(['app', 'blog post', 'tool', 'habit'])} for {rng.choice(['meetings', 'mood tracking', 'budgeting', 'reading'])}",
+            context=rng.choice(['', 'Shower thought', 'From a podcast']), created_at=stamp(days))
+        for i in range(ideas)
+    ]
+    return {'mood_entries': mood_entries, 'decisions': decision_rows, 'ideas': idea_rows}
+
+
+def create_fake_client(*args, **kwargs):
+    """Stand-in for supabase.create_client"""
+    return FakeSupabase(seeded_tables())
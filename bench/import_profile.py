@@ -0,0 +1,95 @@
+"""
+Import-time profile of the Life Dashboard
+
+Renders the login page (streamlit_app.py through Streamlit's AppTest) or
+imports a module in a fresh interpreter with `python -X importtime` and
+reports the slowest imports by cumulative time, so heavy libraries that
+sneak back into the page's start-up path show up at a glance.
+
+    python -m bench.import_profile                       # the login page
+    python -m bench.import_profile --module pandas       # any module
+    python -m bench.import_profile --top 40
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+APP_PATH = ROOT / "streamlit_app.py"
+
+# A fresh app process rendering the login page: the page script's
+# module-level imports plus everything it runs before the password check
+LOGIN_PAGE = (
+    "from streamlit.testing.v1 import AppTest; "
+    f"at = AppTest.from_file({str(APP_PATH)!r}, default_timeout=60); at.run(); "
+    "assert not at.exception, at.exception[0].message"
+)
+
+# Libraries the app should only import in the sections that use them
+HEAVY_MODULES = ['pandas', 'altair', 'feedparser', 'psutil', 'supabase', 'requests', 'numpy', 'scipy']
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def profile_imports(modules=None):
+    """Import modules (default: render the login page) in a fresh interpreter.
+
+    Returns (total seconds, rows). Each row is a dict with the module name,
+    its own and cumulative import time in seconds and its nesting depth.
+    """
+    code = "; ".join(f"import {module}" for module in modules) if modules else LOGIN_PAGE
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            rows.append({
+                'module': name,
+                'self_s': int(own) / 1e6,
+                'cumulative_s': int(cumulative) / 1e6,
+                'depth': len(indent) // 2,
+            })
+    # Top-level imports (depth 0) add up to the whole import cost
+    total = sum(row['cumulative_s'] for row in rows if row['depth'] == 0)
+    return total, rows
+
+
+def print_report(total, rows, top):
+    print(f"{'module':<48} {'cumulative ms':>14} {'self ms':>10}")
+    for row in sorted(rows, key=lambda r: r['cumulative_s'], reverse=True)[:top]:
+        print(f"{row['module']:<48} {row['cumulative_s'] * 1000:>14.1f} {row['self_s'] * 1000:>10.1f}")
+    print(f"\nTotal import time: {total * 1000:.1f} ms")
+
+    loaded = {row['module'] for row in rows}
+    eager = [module for module in HEAVY_MODULES if module in loaded]
+    if eager:
+        print(f"Heavy libraries imported eagerly: {', '.join(eager)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile Life Dashboard import time")
+    parser.add_argument('--module', action='append',
+                        help="Module to import (repeatable; default: render the login page)")
+    parser.add_argument('--top', type=int, default=25, help="Rows to show (default: 25)")
+    args = parser.parse_args()
+
+    try:
+        total, rows = profile_imports(args.module)
+    except RuntimeError as e:
+        sys.exit(f"Import failed: {e}")
+    print_report(total, rows, args.top)
+
+
+if __name__ == '__main__':
+    main()
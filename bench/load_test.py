@@ -0,0 +1,283 @@
+"""
+Concurrent-session load test for the Life Dashboard
+
+Starts the stub upstreams and a `streamlit run` server for the dashboard,
+then drives N simulated browser sessions over Streamlit's websocket protocol
+(BackMsg / ForwardMsg protobufs, sent with the websockets package Streamlit
+itself depends on). Each session logs in, reruns the page the way opening
+sections does (expanders are client-side, so the server sees a plain rerun)
+and saves a mood. Concurrency ramps through --levels and each level reports
+rerun latency percentiles plus server CPU and memory. Memory is measured
+against a baseline taken after one warm-up session, so the app's own
+start-up cost is not counted as per-session memory.
+
+    python -m bench.load_test --levels 1,4,16,32 --iterations 5
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import psutil
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+from bench.stub_server import start_stub_server, stub_environment
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+STUB_APP = Path(__file__).resolve().parent / "stub_app.py"
+
+WIDGET_TYPES = ('button', 'text_input', 'text_area')
+
+# Page reruns per iteration standing in for opening sections
+SECTION_RERUNS = 3
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class SimulatedSession:
+    """One browser tab talking to the Streamlit server"""
+
+    def __init__(self, url, password):
+        self.url = url
+        self.password = password
+        self.ws = None
+        self.widgets = {}
+        self.message_cache = {}
+        self.latencies = []
+
+    async def connect(self):
+        self.ws = await connect(self.url, max_size=64 * 1024 * 1024)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def rerun(self, widget_states=()):
+        """Request a rerun and wait until the script finishes; returns seconds"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        for label, field, value in widget_states:
+            widget = msg.rerun_script.widget_states.widgets.add()
+            widget.id = self.widgets[label]
+            setattr(widget, field, value)
+
+        started = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        await self._read_until_finished()
+        elapsed = time.perf_counter() - started
+        self.latencies.append(elapsed)
+        return elapsed
+
+    async def _read_until_finished(self):
+        self.widgets = {}
+        while True:
+            try:
+                data = await self.ws.recv()
+            except ConnectionClosed:
+                raise ConnectionError("websocket closed by server")
+            fwd = ForwardMsg.FromString(data)
+            kind = fwd.WhichOneof('type')
+
+            if kind == 'ref_hash':
+                fwd = self.message_cache.get(fwd.ref_hash, fwd)
+                kind = fwd.WhichOneof('type')
+            elif fwd.hash:
+                self.message_cache[fwd.hash] = fwd
+
+            if kind == 'delta' and fwd.delta.WhichOneof('type') == 'new_element':
+                element = fwd.delta.new_element
+                element_type = element.WhichOneof('type')
+                if element_type in WIDGET_TYPES:
+                    widget = getattr(element, element_type)
+                    self.widgets[widget.label] = widget.id
+            elif kind == 'script_finished':
+                if fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return
+                # st.rerun() - only the widgets of the final run count
+                self.widgets = {}
+
+    async def login(self):
+        await self.rerun()
+        await self.rerun([
+            ('Password', 'string_value', self.password),
+            ('Login', 'trigger_value', True),
+        ])
+        if 'Login' in self.widgets:
+            raise RuntimeError("login failed - check --password")
+
+    async def save_mood(self, emoji, note):
+        await self.rerun([(emoji, 'trigger_value', True)])
+        await self.rerun([
+            ('Add a note (optional):', 'string_value', note),
+            ('💾 Save Mood', 'trigger_value', True),
+        ])
+
+    async def run(self, iterations):
+        await self.connect()
+        await self.login()
+        for i in range(iterations):
+            for _ in range(SECTION_RERUNS):
+                await self.rerun()
+            await self.save_mood('🙂', f"load test {i}")
+
+
+async def sample_process(process, samples, stop):
+    """Collect server CPU percent every half second until stop is set"""
+    process.cpu_percent(interval=None)
+    while not stop.is_set():
+        await asyncio.sleep(0.5)
+        samples.append(process.cpu_percent(interval=None))
+
+
+async def run_level(url, password, sessions, iterations, process, baseline_rss, previous_rss):
+    """Drive `sessions` concurrent sessions; returns the level's report row.
+
+    Memory per session is measured against baseline_rss (after warm-up);
+    rss_delta_mib is the growth since the previous level.
+    """
+    clients = [SimulatedSession(url, password) for _ in range(sessions)]
+    cpu_samples = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_process(process, cpu_samples, stop))
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(c.run(iterations) for c in clients), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await sampler
+    rss = process.memory_info().rss
+    for client in clients:
+        await client.close()
+
+    latencies = [s for c in clients for s in c.latencies]
+    errors = [o for o in outcomes if isinstance(o, Exception)]
+    return {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'errors': len(errors),
+        'first_error': str(errors[0]) if errors else '',
+        'elapsed_s': elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000 if latencies else 0.0,
+        'p95_ms': percentile(latencies, 95) * 1000 if latencies else 0.0,
+        'p99_ms': percentile(latencies, 99) * 1000 if latencies else 0.0,
+        'cpu_pct': sum(cpu_samples) / len(cpu_samples) if cpu_samples else 0.0,
+        'rss_mib': rss / 2**20,
+        'rss_delta_mib': (rss - previous_rss) / 2**20,
+        'rss_per_session_mib': (rss - baseline_rss) / sessions / 2**20,
+    }
+
+
+def start_app_server(port, stub_base_url):
+    """Launch `streamlit run` on the stubbed app and wait until it is healthy"""
+    env = dict(os.environ)
+    env.update(stub_environment(stub_base_url))
+    env['STUB_BASE_URL'] = stub_base_url
+    env['SNAPSHOT_DIR'] = tempfile.mkdtemp(prefix='load-snapshots-')
+    env['NEWS_ARCHIVE_DIR'] = tempfile.mkdtemp(prefix='load-news-')
+    env['ROLLUP_DB'] = os.path.join(tempfile.mkdtemp(prefix='load-rollups-'), 'rollups.sqlite')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(REPO_DIR), env.get('PYTHONPATH')]))
+
+    log = tempfile.TemporaryFile()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', str(STUB_APP),
+         '--server.headless=true', f'--server.port={port}', '--server.address=127.0.0.1',
+         '--server.enableXsrfProtection=false', '--browser.gatherUsageStats=false'],
+        cwd=REPO_DIR, env=env, stdout=subprocess.DEVNULL, stderr=log,
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            log.seek(0)
+            raise RuntimeError(f"streamlit exited: {log.read().decode(errors='replace')[-2000:]}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError("streamlit did not become healthy within 60s")
+
+
+def print_report(rows):
+    print(f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'cpu %':>6} {'rss MiB':>8} {'Δ MiB':>8} {'MiB/sess':>8}")
+    for row in rows:
+        print(f"{row['sessions']:>8} {row['reruns']:>7} {row['errors']:>6} {row['p50_ms']:>8.0f} "
+              f"{row['p95_ms']:>8.0f} {row['p99_ms']:>8.0f} {row['cpu_pct']:>6.0f} "
+              f"{row['rss_mib']:>8.1f} {row['rss_delta_mib']:>+8.1f} {row['rss_per_session_mib']:>8.2f}")
+        if row['first_error']:
+            print(f"         first error: {row['first_error']}")
+
+
+async def ramp(url, password, levels, iterations, process):
+    # One full session first, so imports, caches and the section pool are warm
+    # before the memory baseline is taken
+    warm_up = SimulatedSession(url, password)
+    try:
+        await warm_up.run(1)
+    finally:
+        await warm_up.close()
+    baseline_rss = previous_rss = process.memory_info().rss
+
+    rows = []
+    for sessions in levels:
+        row = await run_level(url, password, sessions, iterations, process, baseline_rss, previous_rss)
+        previous_rss = row['rss_mib'] * 2**20
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Life Dashboard with simulated sessions")
+    parser.add_argument('--levels', default='1,2,4,8,16,32',
+                        help="Comma-separated concurrent session counts (default: 1,2,4,8,16,32)")
+    parser.add_argument('--iterations', type=int, default=3,
+                        help="Section-open + mood-save cycles per session (default: 3)")
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help="Stub upstream latency in seconds (default: 0)")
+    parser.add_argument('--password', default='nick123', help="APP_PASSWORD of the app under test")
+    parser.add_argument('--port', type=int, default=0, help="Streamlit port (default: any free port)")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(',') if level.strip()]
+    port = args.port or free_port()
+
+    stub, stub_base_url = start_stub_server(delay=args.delay)
+    server = start_app_server(port, stub_base_url)
+    try:
+        process = psutil.Process(server.pid)
+        url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        rows = asyncio.run(ramp(url, args.password, levels, args.iterations, process))
+        print_report(rows)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        stub.shutdown()
+
+
+if __name__ == '__main__':
+    main()
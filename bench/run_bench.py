@@ -0,0 +1,241 @@
+"""
+Component benchmarks for the Life Dashboard
+
+Runs the fetchers, the render builders and full app reruns (via Streamlit's
+AppTest) against the local stub upstreams and the fake Supabase client, and
+reports cold (empty cache) and warm latency plus peak allocation for each.
+
+    python -m bench.run_bench
+    python -m bench.run_bench --delay 0.3            # slow upstreams
+    python -m bench.run_bench --json bench.json      # save results
+    python -m bench.run_bench --baseline bench.json  # fail on regressions
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from bench.fake_supabase import create_fake_client
+from bench.stub_server import start_stub_server, stub_environment, stub_rss_feeds
+
+APP_PATH = Path(__file__).resolve().parent.parent / "streamlit_app.py"
+
+# Differences below this many seconds are noise, never regressions
+MIN_REGRESSION_SECONDS = 0.002
+
+
+def install_stubs(delay):
+    """Point every upstream at the stub server and Supabase at the fake client"""
+    server, base_url = start_stub_server(delay=delay)
+    os.environ.update(stub_environment(base_url))
+    os.environ['SNAPSHOT_DIR'] = tempfile.mkdtemp(prefix='bench-snapshots-')
+    os.environ['STOCK_HISTORY_DIR'] = tempfile.mkdtemp(prefix='bench-history-')
+    os.environ['NEWS_ARCHIVE_DIR'] = tempfile.mkdtemp(prefix='bench-news-')
+    os.environ['ROLLUP_DB'] = os.path.join(tempfile.mkdtemp(prefix='bench-rollups-'), 'rollups.sqlite')
+
+    # Imported only now so the config picks up the stub environment
+    import supabase
+    from life_dashboard import config
+    stub_rss_feeds(config.RSS_FEEDS, base_url)
+    supabase.create_client = create_fake_client
+    return server
+
+
+def measure(func, *args):
+    """Run func once; returns (seconds, peak bytes allocated during the call)"""
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    return elapsed, max(0, peak - baseline)
+
+
+def bench(func, repeat, reset=None, args=()):
+    """Cold run (after reset) followed by `repeat` warm runs"""
+    if reset:
+        reset()
+    cold_s, cold_bytes = measure(func, *args)
+    warm = [measure(func, *args) for _ in range(repeat)]
+    return {
+        'cold_s': cold_s,
+        'cold_kib': cold_bytes / 1024,
+        'warm_s': statistics.median(s for s, _ in warm),
+        'warm_kib': statistics.median(b for _, b in warm) / 1024,
+    }
+
+
+def bench_functions(repeat):
+    """Every fetcher and render builder on its own"""
+    from life_dashboard import fetchers, render, stock_history
+
+    results = {}
+    for name in ['fetch_weather', 'fetch_news', 'fetch_stocks', 'fetch_notion_tasks',
+                 'fetch_todoist_tasks', 'fetch_kimi_todos']:
+        func = getattr(fetchers, name)
+        results[f"function/{name}"] = bench(func, repeat, reset=func.clear)
+
+    weather = fetchers.fetch_weather()
+    news = fetchers.fetch_news()
+    entries = create_fake_client().table('decisions').select('*').limit(10).execute().data
+    builders = {
+        'forecast_html': (render.forecast_html, (weather['forecast'],)),
+        'news_markdown': (render.news_markdown, (news['general'][:15],)),
+        'entries_markdown': (render.entries_markdown, (entries, 'decision')),
+    }
+    for name, (func, args) in builders.items():
+        results[f"function/{name}"] = bench(func, repeat, args=args)
+
+    # Cold: full history download; warm: incremental appends
+    results["function/update_history"] = bench(lambda: stock_history.update_history(force=True), repeat)
+    results["function/watchlist_trends"] = bench(
+        stock_history.watchlist_trends, repeat, reset=stock_history.watchlist_trends.clear
+    )
+    return results
+
+
+def bench_sections(repeat):
+    """Data plus render path for each section that lives outside the page script"""
+    from life_dashboard import fetchers, render
+
+    def weather():
+        render.forecast_html(fetchers.fetch_weather()['forecast'])
+
+    def news():
+        data = fetchers.fetch_news()
+        for category in ['general', 'tech', 'market']:
+            render.news_markdown(data[category][:15])
+
+    def tasks():
+        fetchers.fetch_notion_tasks()
+        fetchers.fetch_todoist_tasks()
+        fetchers.fetch_kimi_todos()
+
+    def clear_all():
+        import streamlit as st
+        st.cache_data.clear()
+
+    sections = {'weather': weather, 'news': news, 'stocks': fetchers.fetch_stocks, 'tasks': tasks}
+    return {f"section/{name}": bench(func, repeat, reset=clear_all) for name, func in sections.items()}
+
+
+def bench_app(repeat):
+    """Full script reruns through AppTest: login page and authenticated dashboard.
+
+    The page's own section timers (life_dashboard.metrics) give the
+    per-section split of the dashboard reruns.
+    """
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    from life_dashboard.metrics import METRICS
+
+    def clear_all():
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        METRICS.reset()
+
+    def section_timers():
+        return {row['labels']['section']: row for row in METRICS.timers() if row['name'] == 'section_seconds'}
+
+    results = {}
+    for name, authenticated in [('login', False), ('dashboard', True)]:
+        at = AppTest.from_file(str(APP_PATH), default_timeout=60)
+        at.session_state['authenticated'] = authenticated
+
+        clear_all()
+        cold_s, cold_bytes = measure(at.run)
+        cold_sections = section_timers()
+        METRICS.reset()
+        warm = [measure(at.run) for _ in range(repeat)]
+        warm_sections = section_timers()
+        if at.exception:
+            raise RuntimeError(f"{name} rerun raised: {at.exception[0].message}")
+
+        results[f"app/{name}"] = {
+            'cold_s': cold_s,
+            'cold_kib': cold_bytes / 1024,
+            'warm_s': statistics.median(s for s, _ in warm),
+            'warm_kib': statistics.median(b for _, b in warm) / 1024,
+        }
+        for section, cold_row in cold_sections.items():
+            warm_row = warm_sections.get(section, cold_row)
+            results[f"app-section/{section}"] = {
+                'cold_s': cold_row['total'],
+                'cold_kib': None,
+                'warm_s': warm_row['mean'],
+                'warm_kib': None,
+            }
+    return results
+
+
+def print_report(results):
+    def kib(value):
+        return f"{value:>10.0f}" if value is not None else f"{'-':>10}"
+
+    print(f"{'benchmark':<32} {'cold ms':>10} {'warm ms':>10} {'cold KiB':>10} {'warm KiB':>10}")
+    for name, r in results.items():
+        print(f"{name:<32} {r['cold_s'] * 1000:>10.1f} {r['warm_s'] * 1000:>10.2f} "
+              f"{kib(r['cold_kib'])} {kib(r['warm_kib'])}")
+
+
+def find_regressions(results, baseline, tolerance):
+    """Benchmarks whose cold or warm latency grew past tolerance x baseline"""
+    regressions = []
+    for name, r in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for key in ['cold_s', 'warm_s']:
+            if r[key] > before[key] * tolerance and r[key] - before[key] > MIN_REGRESSION_SECONDS:
+                regressions.append(f"{name} {key}: {before[key] * 1000:.1f} ms -> {r[key] * 1000:.1f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Life Dashboard against stub upstreams")
+    parser.add_argument('--repeat', type=int, default=5, help="Warm runs per benchmark (default: 5)")
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help="Stub upstream latency in seconds (default: 0)")
+    parser.add_argument('--only', choices=['functions', 'sections', 'app'], help="Run one group only")
+    parser.add_argument('--json', help="Write results to this file")
+    parser.add_argument('--baseline', help="Compare against results saved with --json")
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help="Allowed slowdown factor against the baseline (default: 1.5)")
+    args = parser.parse_args()
+
+    server = install_stubs(args.delay)
+    tracemalloc.start()
+    results = {}
+    try:
+        groups = {'functions': bench_functions, 'sections': bench_sections, 'app': bench_app}
+        for group, run in groups.items():
+            if args.only in (None, group):
+                results.update(run(args.repeat))
+    finally:
+        tracemalloc.stop()
+        server.shutdown()
+
+    print_report(results)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+    if args.baseline:
+        regressions = find_regressions(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
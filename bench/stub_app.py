@@ -0,0 +1,25 @@
+"""
+Streamlit entry point that runs the dashboard against stubbed upstreams
+
+Used by the load test: `streamlit run bench/stub_app.py` with STUB_BASE_URL
+and the variables from stub_environment() set. RSS feeds are repointed at the
+stub server and Supabase is replaced by the in-process fake before the real
+page script runs.
+"""
+
+import os
+import runpy
+from pathlib import Path
+
+import supabase
+
+from bench.fake_supabase import create_fake_client
+from bench.stub_server import stub_rss_feeds
+from life_dashboard import config
+
+APP_PATH = Path(__file__).resolve().parent.parent / "streamlit_app.py"
+
+stub_rss_feeds(config.RSS_FEEDS, os.environ['STUB_BASE_URL'])
+supabase.create_client = create_fake_client
+
+runpy.run_path(str(APP_PATH), run_name='__main__')
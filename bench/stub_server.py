@@ -0,0 +1,165 @@
+"""
+Local stub for every upstream the dashboard talks to
+
+Replays the recorded responses in bench/fixtures for wttr.in, Open-Meteo,
+Finnhub, the RSS feeds, Notion and Todoist; Finnhub candles are generated
+for whatever range is asked for. An optional per-request delay
+simulates slow upstreams.
+
+Standalone:
+    python -m bench.stub_server --port 8765 --delay 0.2
+"""
+
+import argparse
+import json
+import math
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Feed slug (served at /rss/<slug>.xml) for each source in RSS_FEEDS
+RSS_SLUGS = {
+    'BBC': 'bbc',
+    'Reuters': 'reuters',
+    'TechCrunch': 'techcrunch',
+    'VentureBeat AI': 'venturebeat',
+    'Yahoo Finance': 'yahoo',
+}
+
+
+def _fixture(name):
+    return (FIXTURES_DIR / name).read_bytes()
+
+
+def _candles(query):
+    """Deterministic Finnhub-shaped candles for the requested symbol and range"""
+    symbol = query.get('symbol', ['STUB'])[0]
+    resolution = query.get('resolution', ['D'])[0]
+    step = 86400 if resolution == 'D' else int(resolution) * 60
+    start = int(query.get('from', ['0'])[0]) // step * step
+    end = int(query.get('to', ['0'])[0])
+    base = 50 + zlib.crc32(symbol.encode()) % 400
+
+    columns = {key: [] for key in 'tohlcv'}
+    for t in range(start, end + 1, step):
+        close = base * (1 + 0.1 * math.sin(t / step / 9) + 0.02 * math.sin(t / step))
+        columns['t'].append(t)
+        columns['o'].append(round(close * 0.995, 2))
+        columns['h'].append(round(close * 1.01, 2))
+        columns['l'].append(round(close * 0.99, 2))
+        columns['c'].append(round(close, 2))
+        columns['v'].append(1_000_000)
+    return dict(columns, s='ok' if columns['t'] else 'no_data')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Routes upstream-shaped requests to recorded fixtures"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body, content_type='application/json', status=200):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        url = urlparse(self.path)
+        path = url.path
+        query = parse_qs(url.query)
+
+        if path.startswith('/wttr/'):
+            return _fixture('wttr.json'), 'application/json'
+        if path == '/open-meteo/v1/forecast':
+            name = 'open_meteo_daily.json' if 'daily' in query else 'open_meteo_current.json'
+            return _fixture(name), 'application/json'
+        if path == '/finnhub/api/v1/quote':
+            return _fixture('finnhub_quote.json'), 'application/json'
+        if path == '/finnhub/api/v1/stock/candle':
+            return json.dumps(_candles(query)).encode(), 'application/json'
+        if path.startswith('/rss/') and path.endswith('.xml'):
+            return _fixture(f"rss_{path[5:-4]}.xml"), 'application/rss+xml'
+        if path.startswith('/notion/v1/databases/') and path.endswith('/query'):
+            return _fixture('notion_query.json'), 'application/json'
+        if path == '/todoist/rest/v2/tasks':
+            return _fixture('todoist_tasks.json'), 'application/json'
+        return None, None
+
+    def do_GET(self):
+        try:
+            body, content_type = self._route()
+        except FileNotFoundError:
+            body, content_type = None, None
+        if body is None:
+            self._send(json.dumps({'error': 'not found'}).encode(), status=404)
+        else:
+            self._send(body, content_type)
+
+    def do_POST(self):
+        # Drain the request body before answering
+        self.rfile.read(int(self.headers.get('Content-Length', 0) or 0))
+        self.do_GET()
+
+
+def start_stub_server(port=0, delay=0.0):
+    """Start the stub server in a daemon thread; returns (server, base_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    server.daemon_threads = True
+    server.delay = delay
+    thread = threading.Thread(target=server.serve_forever, name='stub-server', daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def stub_environment(base_url):
+    """Environment variables pointing every upstream at the stub server"""
+    return {
+        'WTTR_URL': f"{base_url}/wttr",
+        'OPEN_METEO_URL': f"{base_url}/open-meteo",
+        'FINNHUB_URL': f"{base_url}/finnhub",
+        'NOTION_URL': f"{base_url}/notion",
+        'TODOIST_URL': f"{base_url}/todoist",
+        'FINNHUB_API_KEY': 'bench',
+        'NOTION_API_KEY': 'bench',
+        'TODOIST_API_KEY': 'bench',
+    }
+
+
+def stub_rss_feeds(rss_feeds, base_url):
+    """Repoint RSS_FEEDS (in place) at the stub server's recorded feeds"""
+    for category, feeds in rss_feeds.items():
+        rss_feeds[category] = [
+            (f"{base_url}/rss/{RSS_SLUGS.get(source, 'bbc')}.xml", source)
+            for _, source in feeds
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded upstream responses")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help="Seconds to sleep before every response (default: 0)")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.port, args.delay)
+    print(f"Stub upstreams at {base_url}")
+    for key, value in stub_environment(base_url).items():
+        print(f"  export {key}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+"""
+Life Dashboard - data layer shared by the Streamlit app and headless tools
+"""
@@ -0,0 +1,194 @@
+"""
+AA meeting schedule and attendance statistics
+
+MeetingSchedule sorts the weekly meetings by minute of the week once, so
+the next meeting after any moment is a binary search. AttendanceStats
+keeps the attended days with weekly and monthly counts and the longest
+streak, updated one check-in at a time instead of rescanning
+aa_attended.json.
+
+Meetings in aa_meetings.json look like
+    {"name": "Sunrise Group", "day": "Tuesday", "time": "7:30 PM", "location": "..."}
+where day may also be a number (0 = Monday) and time may be 24-hour ("19:30").
+"""
+
+import bisect
+import os
+import threading
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from life_dashboard.config import EASTERN
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def _weekday(value):
+    if isinstance(value, int):
+        return value % 7
+    name = str(value).strip().lower()
+    for index, weekday in enumerate(WEEKDAYS):
+        if len(name) >= 3 and weekday.startswith(name[:3]):
+            return index
+    raise ValueError(f"Unknown weekday: {value}")
+
+
+def _minutes(value):
+    """Minutes after midnight of '19:30', '7:30 PM' or '7 pm'"""
+    text = str(value).strip().upper().replace('.', '')
+    for fmt in ('%H:%M', '%I:%M %p', '%I:%M%p', '%I %p', '%I%p'):
+        try:
+            parsed = datetime.strptime(text, fmt)
+            return parsed.hour * 60 + parsed.minute
+        except ValueError:
+            continue
+    raise ValueError(f"Unknown time: {value}")
+
+
+class MeetingSchedule:
+    """Weekly meetings sorted by minute of the week"""
+
+    def __init__(self, meetings):
+        slots = []
+        for meeting in meetings:
+            try:
+                minute = _weekday(meeting.get('day', meeting.get('weekday'))) * 1440 + \
+                    _minutes(meeting.get('time', meeting.get('start')))
+            except (TypeError, ValueError):
+                continue
+            slots.append((minute, meeting))
+        slots.sort(key=lambda slot: slot[0])
+        self._minutes = [minute for minute, _ in slots]
+        self._meetings = [meeting for _, meeting in slots]
+
+    def __len__(self):
+        return len(self._meetings)
+
+    @staticmethod
+    def _week_position(now):
+        """(start of now's week, minute of the week) in Eastern time"""
+        now = (now or datetime.now(EASTERN)).astimezone(EASTERN)
+        week_start = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+        return week_start, now.weekday() * 1440 + now.hour * 60 + now.minute
+
+    def _slot(self, week_start, index):
+        weeks, index = divmod(index, len(self._meetings))
+        return week_start + timedelta(weeks=weeks, minutes=self._minutes[index]), self._meetings[index]
+
+    def upcoming(self, now=None, count=1):
+        """The next `count` meetings starting at or after now: (start, meeting) pairs"""
+        if not self._meetings:
+            return []
+        week_start, minute = self._week_position(now)
+        position = bisect.bisect_left(self._minutes, minute)
+        return [self._slot(week_start, position + offset) for offset in range(count)]
+
+    def next_meeting(self, now=None):
+        """(start, meeting) of the next meeting, or None"""
+        upcoming = self.upcoming(now)
+        return upcoming[0] if upcoming else None
+
+    def last_meeting(self, now=None):
+        """(start, meeting) of the most recent meeting that has started, or None"""
+        if not self._meetings:
+            return None
+        week_start, minute = self._week_position(now)
+        return self._slot(week_start, bisect.bisect_right(self._minutes, minute) - 1)
+
+
+class AttendanceStats:
+    """Attended days with streaks and weekly/monthly counts, updated per check-in"""
+
+    def __init__(self, entries=()):
+        self.days = set()
+        self.weekly = Counter()
+        self.monthly = Counter()
+        self.longest_streak = 0
+        for entry in entries:
+            try:
+                self.add(date.fromisoformat(entry['date'][:10]))
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    def _run_through(self, day):
+        """Length of the run of consecutive attended days containing day"""
+        start = end = day
+        while start - timedelta(days=1) in self.days:
+            start -= timedelta(days=1)
+        while end + timedelta(days=1) in self.days:
+            end += timedelta(days=1)
+        return (end - start).days + 1
+
+    def add(self, day):
+        """Record one attended day (repeat check-ins on a day count once)"""
+        if day in self.days:
+            return
+        self.days.add(day)
+        iso = day.isocalendar()
+        self.weekly[(iso[0], iso[1])] += 1
+        self.monthly[(day.year, day.month)] += 1
+        self.longest_streak = max(self.longest_streak, self._run_through(day))
+
+    def current_streak(self, today=None):
+        """Consecutive attended days ending today (or yesterday, if today is still open)"""
+        today = today or datetime.now(EASTERN).date()
+        day = today if today in self.days else today - timedelta(days=1)
+        streak = 0
+        while day in self.days:
+            streak += 1
+            day -= timedelta(days=1)
+        return streak
+
+    def this_week(self, today=None):
+        iso = (today or datetime.now(EASTERN).date()).isocalendar()
+        return self.weekly[(iso[0], iso[1])]
+
+    def this_month(self, today=None):
+        today = today or datetime.now(EASTERN).date()
+        return self.monthly[(today.year, today.month)]
+
+    def summary(self, today=None):
+        return {
+            'total': len(self.days),
+            'current_streak': self.current_streak(today),
+            'longest_streak': self.longest_streak,
+            'this_week': self.this_week(today),
+            'this_month': self.this_month(today),
+        }
+
+
+# Stats per attendance file: path -> (file mtime, AttendanceStats)
+_stats_cache = {}
+_stats_lock = threading.Lock()
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def attendance_stats(path, load_entries):
+    """AttendanceStats for the attendance file, rebuilt only if another process changed it.
+
+    load_entries() returns the file's entries when a rebuild is needed.
+    """
+    mtime = _mtime(path)
+    with _stats_lock:
+        cached = _stats_cache.get(str(path))
+        if cached and cached[0] == mtime:
+            return cached[1]
+    stats = AttendanceStats(load_entries())
+    with _stats_lock:
+        _stats_cache[str(path)] = (mtime, stats)
+    return stats
+
+
+def record_attendance(path, day):
+    """Add a check-in that was just written to path to its cached stats"""
+    with _stats_lock:
+        cached = _stats_cache.get(str(path))
+        if cached:
+            cached[1].add(day)
+            _stats_cache[str(path)] = (_mtime(path), cached[1])
@@ -0,0 +1,198 @@
+"""
+Bounded, accounted data caches
+
+timed_cache wraps st.cache_data with hit/miss metrics, a per-cache entry
+limit and a per-cache byte budget. A ledger mirrors each cache's entries
+(estimated deep size, last use) so the diagnostics view can show what the
+caches hold and the least recently used entries can be evicted when a cache
+grows past its budget.
+"""
+
+import functools
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+from life_dashboard.config import get_settings
+from life_dashboard.metrics import METRICS
+
+# Every ledger by cached function (module.qualname), for diagnostics
+LEDGERS = {}
+
+_call_state = threading.local()
+
+
+def deep_size(obj, seen=None):
+    """Estimated memory held by obj and everything it references, in bytes"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    memory_usage = getattr(obj, 'memory_usage', None)
+    if callable(memory_usage) and hasattr(obj, 'columns'):
+        # pandas DataFrame
+        return int(memory_usage(deep=True).sum())
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_size(vars(obj), seen)
+    return size
+
+
+def _entry_key(args, kwargs):
+    return hashlib.sha1(repr((args, sorted(kwargs.items()))).encode()).hexdigest()
+
+
+class CacheLedger:
+    """Mirror of one cache's entries: key -> (args, kwargs, bytes, stored at), LRU order"""
+
+    def __init__(self, name, max_entries, max_bytes, ttl=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl if isinstance(ttl, (int, float)) else None
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def _expire(self):
+        if self.ttl is None:
+            return
+        cutoff = time.time() - self.ttl
+        for key in [k for k, entry in self._entries.items() if entry[3] < cutoff]:
+            del self._entries[key]
+
+    def touch(self, args, kwargs):
+        """Mark an entry as most recently used (cache hit)"""
+        key = _entry_key(args, kwargs)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def store(self, args, kwargs, value):
+        """Record a new entry; returns the (args, kwargs) of entries to evict"""
+        key = _entry_key(args, kwargs)
+        size = deep_size(value)
+        evicted = []
+        with self._lock:
+            self._expire()
+            self._entries[key] = (args, kwargs, size, time.time())
+            self._entries.move_to_end(key)
+            # Streamlit drops the least recently used entry past max_entries itself
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            # Past the byte budget we evict LRU entries ourselves, never the new one
+            total = sum(entry[2] for entry in self._entries.values())
+            while total > self.max_bytes and len(self._entries) > 1:
+                _, (old_args, old_kwargs, old_size, _) = self._entries.popitem(last=False)
+                total -= old_size
+                evicted.append((old_args, old_kwargs))
+        self._publish()
+        return evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self._publish()
+
+    def stats(self):
+        with self._lock:
+            self._expire()
+            entries = len(self._entries)
+            total = sum(entry[2] for entry in self._entries.values())
+        return {
+            'fn': self.name,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+        }
+
+    def _publish(self):
+        stats = self.stats()
+        METRICS.set('cache_entries', stats['entries'], fn=self.name)
+        METRICS.set('cache_bytes', stats['bytes'], fn=self.name)
+
+
+def cache_stats():
+    """Entry count and estimated size of every cache"""
+    return [ledger.stats() for _, ledger in sorted(LEDGERS.items())]
+
+
+def timed_cache(**cache_kwargs):
+    """st.cache_data with metrics, accounting and size limits.
+
+    Takes the same arguments as st.cache_data. max_entries defaults to the
+    configured limit for the function (CACHE_MAX_ENTRIES[_<NAME>]) and the
+    byte budget comes from CACHE_MAX_BYTES[_<NAME>]. .clear() keeps working.
+    """
+    def decorator(func):
+        name = func.__name__
+        settings = get_settings()
+        max_entries = settings.cache_limit('entries', name, cache_kwargs.pop('max_entries', None))
+        max_bytes = settings.cache_limit('bytes', name)
+        # Streamlit re-decorates the functions defined in the page script on
+        # every rerun; they share one st.cache_data cache, so share the ledger too
+        ledger = LEDGERS.setdefault(
+            f"{func.__module__}.{func.__qualname__}",
+            CacheLedger(name, max_entries, max_bytes, cache_kwargs.get('ttl'))
+        )
+
+        @functools.wraps(func)
+        def execute(*args, **kwargs):
+            _call_state.missed = True
+            METRICS.inc('cache_misses_total', fn=name)
+            with METRICS.timer('fetch_seconds', fn=name):
+                value = func(*args, **kwargs)
+            _call_state.evicted = ledger.store(args, kwargs, value)
+            return value
+
+        cached_func = st.cache_data(max_entries=max_entries, **cache_kwargs)(execute)
+
+        def evict(entries):
+            for args, kwargs in entries:
+                try:
+                    cached_func.clear(*args, **kwargs)
+                except TypeError:
+                    # Streamlit without per-entry clear: drop the whole cache
+                    cached_func.clear()
+                    ledger.clear()
+                    return
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            outer_state = (getattr(_call_state, 'missed', False), getattr(_call_state, 'evicted', []))
+            _call_state.missed = False
+            _call_state.evicted = []
+            try:
+                with METRICS.timer('call_seconds', fn=name):
+                    return cached_func(*args, **kwargs)
+            finally:
+                if not _call_state.missed:
+                    METRICS.inc('cache_hits_total', fn=name)
+                    ledger.touch(args, kwargs)
+                evicted = _call_state.evicted
+                _call_state.missed, _call_state.evicted = outer_state
+                if evicted:
+                    METRICS.inc('cache_evictions_total', len(evicted), fn=name)
+                    evict(evicted)
+
+        def clear():
+            cached_func.clear()
+            ledger.clear()
+
+        wrapper.clear = clear
+        return wrapper
+
+    return decorator
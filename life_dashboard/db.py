@@ -0,0 +1,66 @@
+"""
+Supabase access shared by the app and the command-line tools
+"""
+
+from datetime import datetime, timezone
+
+from life_dashboard.config import get_settings
+from life_dashboard.metrics import METRICS
+
+# Columns of each table, in export order
+TABLE_COLUMNS = {
+    'mood_entries': ['id', 'mood', 'note', 'created_at'],
+    'decisions': ['id', 'decision', 'context', 'created_at'],
+    'ideas': ['id', 'idea', 'context', 'created_at'],
+}
+
+
+def create_supabase_client():
+    """Supabase client for the configured project, or None"""
+    settings = get_settings()
+    if settings.supabase_url and settings.supabase_anon_key:
+        try:
+            from supabase import create_client
+            return create_client(settings.supabase_url, settings.supabase_anon_key)
+        except Exception as e:
+            print(f"Error creating Supabase client: {e}")
+            return None
+    return None
+
+
+def run_query(query):
+    """Execute a Supabase query, recording latency and errors"""
+    METRICS.inc('upstream_requests_total', provider='supabase')
+    try:
+        with METRICS.timer('upstream_seconds', provider='supabase'):
+            return query.execute()
+    except Exception:
+        METRICS.inc('upstream_errors_total', provider='supabase')
+        raise
+
+
+def normalize_timestamp(value, naive_zone=timezone.utc):
+    """ISO timestamp as UTC with microseconds.
+
+    Timestamps without an offset are taken to be in naive_zone (UTC, like
+    Postgres does for the app's own inserts).
+    """
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=naive_zone)
+    return dt.astimezone(timezone.utc).isoformat(timespec='microseconds')
+
+
+def iter_rows(client, table, columns='*', page_size=1000, after_id=None):
+    """Every row of table (with id > after_id, if given), fetched page by page in id order"""
+    start = 0
+    while True:
+        query = client.table(table).select(columns)
+        if after_id is not None:
+            query = query.gt('id', after_id)
+        query = query.order('id').range(start, start + page_size - 1)
+        rows = run_query(query).data or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        start += page_size
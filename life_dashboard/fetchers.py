@@ -0,0 +1,378 @@
+"""
+Upstream fetchers - weather, news, stocks and tasks
+
+Shared by the Streamlit app and the headless snapshot builder.
+"""
+
+import json
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+from life_dashboard.config import (
+    KIMI_TODOS_FILE,
+    RSS_FEEDS,
+    STOCK_CATEGORIES,
+    WEATHER_LAT,
+    WEATHER_LOCATION,
+    WEATHER_LON,
+    get_settings,
+)
+from life_dashboard.caching import timed_cache
+from life_dashboard.metrics import METRICS
+from life_dashboard.news_archive import archive_news
+from life_dashboard.news_dedup import dedupe_news, new_stories
+
+def _get_bytes(url, provider, timeout=10, headers=None):
+    """GET url, recording request, latency, byte and error metrics for provider"""
+    METRICS.inc('upstream_requests_total', provider=provider)
+    try:
+        request = urllib.request.Request(url, headers=headers or {})
+        with METRICS.timer('upstream_seconds', provider=provider):
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                body = response.read()
+    except Exception:
+        METRICS.inc('upstream_errors_total', provider=provider)
+        raise
+    METRICS.inc('upstream_bytes_total', len(body), provider=provider)
+    return body
+
+def _get_json(url, provider, timeout=10):
+    """GET and decode a JSON document (see _get_bytes)"""
+    body = _get_bytes(url, provider, timeout)
+    try:
+        return json.loads(body.decode())
+    except ValueError:
+        METRICS.inc('upstream_errors_total', provider=provider)
+        raise
+
+def _send(method, url, provider, **kwargs):
+    """requests.request with the same metrics as _get_bytes"""
+    import requests
+
+    METRICS.inc('upstream_requests_total', provider=provider)
+    try:
+        with METRICS.timer('upstream_seconds', provider=provider):
+            response = requests.request(method, url, **kwargs)
+    except Exception:
+        METRICS.inc('upstream_errors_total', provider=provider)
+        raise
+    METRICS.inc('upstream_bytes_total', len(response.content), provider=provider)
+    if response.status_code != 200:
+        METRICS.inc('upstream_errors_total', provider=provider)
+    return response
+
+@timed_cache(ttl=900, show_spinner=False)
+def fetch_weather():
+    """Fetch weather from wttr.in and Open-Meteo"""
+    eastern_zone = "America/New_York"
+    
+    WMO_ICONS = {
+        0: '☀️', 1: '🌤️', 2: '⛅', 3: '☁️', 45: '🌫️', 48: '🌫️',
+        51: '🌧️', 53: '🌧️', 55: '🌧️', 61: '🌧️', 63: '🌧️', 65: '🌧️',
+        71: '❄️', 73: '❄️', 75: '❄️', 80: '🌧️', 81: '🌧️', 82: '🌧️',
+        95: '⛈️', 96: '⛈️', 99: '⛈️'
+    }
+    
+    WMO_DESCRIPTIONS = {
+        0: 'Clear', 1: 'Mainly clear', 2: 'Partly cloudy', 3: 'Overcast',
+        45: 'Fog', 48: 'Fog', 51: 'Drizzle', 53: 'Drizzle', 55: 'Dense drizzle',
+        61: 'Rain', 63: 'Rain', 65: 'Heavy rain', 71: 'Snow', 73: 'Snow',
+        75: 'Heavy snow', 80: 'Rain showers', 81: 'Rain showers', 82: 'Violent showers',
+        95: 'Thunderstorm', 96: 'Thunderstorm', 99: 'Thunderstorm'
+    }
+    
+    settings = get_settings()
+    result = {'current': {}, 'forecast': []}
+    
+    # Try wttr.in first
+    try:
+        url = f"{settings.wttr_url}/{WEATHER_LOCATION}?format=j1"
+        data = _get_json(url, 'wttr')
+        
+        current = data.get("current_condition", [{}])[0]
+        result['current'] = {
+            'temp': int(current.get("temp_F", 0)),
+            'feels_like': int(current.get("FeelsLikeF", 0)),
+            'humidity': int(current.get("humidity", 0)),
+            'wind': int(current.get("windspeedMiles", 0)),
+            'condition': current.get("weatherDesc", [{}])[0].get("value", "Unknown"),
+            'icon': '🌤️'
+        }
+    except Exception:
+        # Fallback to Open-Meteo
+        METRICS.inc('upstream_retries_total', provider='wttr')
+        try:
+            url = f"{settings.open_meteo_url}/v1/forecast?latitude={WEATHER_LAT}&longitude={WEATHER_LON}&current=temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m&timezone=America/New_York&temperature_unit=fahrenheit&wind_speed_unit=mph"
+            data = _get_json(url, 'open_meteo')
+            
+            current = data.get("current", {})
+            result['current'] = {
+                'temp': int(current.get("temperature_2m", 0)),
+                'feels_like': int(current.get("temperature_2m", 0)),
+                'humidity': int(current.get("relative_humidity_2m", 0)),
+                'wind': int(current.get("wind_speed_10m", 0)),
+                'condition': WMO_DESCRIPTIONS.get(current.get("weather_code", 0), "Unknown"),
+                'icon': WMO_ICONS.get(current.get("weather_code", 0), '🌤️')
+            }
+        except Exception as e:
+            result['current'] = {'error': str(e)}
+    
+    # Get forecast
+    try:
+        url = f"{settings.open_meteo_url}/v1/forecast?latitude={WEATHER_LAT}&longitude={WEATHER_LON}&daily=weather_code,temperature_2m_max,temperature_2m_min&timezone=America/New_York&temperature_unit=fahrenheit"
+        data = _get_json(url, 'open_meteo')
+        
+        daily = data.get("daily", {})
+        times = daily.get("time", [])[:7]
+        max_temps = daily.get("temperature_2m_max", [])[:7]
+        min_temps = daily.get("temperature_2m_min", [])[:7]
+        codes = daily.get("weather_code", [])[:7]
+        
+        day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+        
+        for i, date_str in enumerate(times):
+            dt = datetime.strptime(date_str, "%Y-%m-%d")
+            result['forecast'].append({
+                'day': day_names[dt.weekday()],
+                'high': int(round(max_temps[i])),
+                'low': int(round(min_temps[i])),
+                'icon': WMO_ICONS.get(codes[i], '☀️')
+            })
+    except Exception:
+        pass
+    
+    return result
+
+@timed_cache(ttl=300)
+def fetch_stocks():
+    """Fetch stock quotes from Finnhub with proper error handling"""
+    settings = get_settings()
+    if not settings.finnhub_api_key:
+        return {'error': 'Configure FINNHUB_API_KEY in Streamlit Cloud secrets'}
+    
+    result = {}
+    
+    for category, tickers in STOCK_CATEGORIES.items():
+        result[category] = []
+        for ticker in tickers:
+            try:
+                url = f"{settings.finnhub_url}/api/v1/quote?symbol={ticker}&token={settings.finnhub_api_key}"
+                data = _get_json(url, 'finnhub', timeout=5)
+                
+                price = data.get('c', 0)
+                change = data.get('dp', 0)
+                
+                if price and price > 0:
+                    result[category].append({
+                        'ticker': ticker,
+                        'price': price,
+                        'change': change
+                    })
+                else:
+                    result[category].append({'ticker': ticker, 'error': True})
+            except Exception:
+                result[category].append({'ticker': ticker, 'error': True})
+    
+    return result
+
+def fetch_candles(ticker, resolution, start, end):
+    """Finnhub candles for ticker between two unix timestamps (not cached).
+
+    Returns Finnhub's column lists ('t', 'o', 'h', 'l', 'c', 'v'); all
+    empty when there is no data for the range.
+    """
+    settings = get_settings()
+    url = (f"{settings.finnhub_url}/api/v1/stock/candle?symbol={ticker}&resolution={resolution}"
+           f"&from={int(start)}&to={int(end)}&token={settings.finnhub_api_key}")
+    data = _get_json(url, 'finnhub', timeout=10)
+    if data.get('s') != 'ok':
+        return {key: [] for key in 'tohlcv'}
+    return {key: data.get(key, []) for key in 'tohlcv'}
+
+@timed_cache(ttl=1800, show_spinner=False)
+def fetch_news():
+    """Fetch news from RSS feeds with proper error handling"""
+    import feedparser
+
+    news_data = {'general': [], 'tech': [], 'market': []}
+    archived = []
+    
+    for category, feeds in RSS_FEEDS.items():
+        for feed_url, source_name in feeds:
+            try:
+                # Download ourselves so the request has a timeout and metrics
+                body = _get_bytes(feed_url, 'rss', headers={'User-Agent': feedparser.USER_AGENT})
+                feed = feedparser.parse(body)
+                for entry in feed.entries[:8]:
+                    news_data[category].append({
+                        'title': entry.get('title', 'No title'),
+                        'link': entry.get('link', '#'),
+                        'source': source_name
+                    })
+                # The archive keeps every entry, not just the ones shown
+                for entry in feed.entries:
+                    published = entry.get('published_parsed') or entry.get('updated_parsed')
+                    archived.append({
+                        'id': entry.get('id'),
+                        'title': entry.get('title', 'No title'),
+                        'link': entry.get('link', '#'),
+                        'source': source_name,
+                        'category': category,
+                        'published': datetime(*published[:6], tzinfo=timezone.utc).isoformat() if published else None
+                    })
+            except Exception:
+                continue
+    
+    try:
+        # One report per story: another feed's copy has a different GUID and link
+        archive_news(new_stories(archived))
+    except OSError as e:
+        print(f"Error archiving news: {e}")
+    
+    # One entry per story, across every category
+    return dedupe_news(news_data)
+
+@timed_cache(ttl=300)
+def fetch_notion_tasks():
+    """Fetch tasks from Notion with proper error handling"""
+    settings = get_settings()
+    if not settings.notion_api_key:
+        return {'error': 'Configure NOTION_API_KEY in Streamlit Cloud secrets'}
+    
+    try:
+        url = f"{settings.notion_url}/v1/databases/{settings.notion_database_id}/query"
+        
+        headers = {
+            "Authorization": f"Bearer {settings.notion_api_key}",
+            "Notion-Version": "2022-06-28",
+            "Content-Type": "application/json"
+        }
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        
+        payload = {
+            "filter": {
+                "or": [
+                    {"property": "Due", "date": {"on_or_before": today}},
+                ]
+            },
+            "sorts": [{"property": "Due", "direction": "ascending"}]
+        }
+        
+        response = _send('POST', url, 'notion', headers=headers, json=payload, timeout=10)
+        
+        if response.status_code != 200:
+            METRICS.inc('upstream_retries_total', provider='notion')
+            response = _send('POST', url, 'notion', headers=headers, json={}, timeout=10)
+        
+        data = response.json()
+        tasks = data.get('results', [])
+        
+        # Filter out completed
+        filtered = []
+        for task in tasks:
+            if not task:
+                continue
+            props = task.get('properties', {})
+            is_done = False
+            
+            for prop_value in props.values():
+                if prop_value is None or not isinstance(prop_value, dict):
+                    continue
+                prop_type = prop_value.get('type') or ''
+                if prop_type == 'status':
+                    status_info = prop_value.get('status') or {}
+                    status_name = (status_info.get('name') or '').lower()
+                    if 'done' in status_name or 'complete' in status_name:
+                        is_done = True
+                        break
+            
+            if not is_done:
+                # Get title
+                title = "Untitled"
+                for prop_value in props.values():
+                    if prop_value is None or not isinstance(prop_value, dict):
+                        continue
+                    if (prop_value.get('type') or '') == 'title':
+                        titles = prop_value.get('title') or []
+                        if titles:
+                            title = (titles[0] or {}).get('plain_text', 'Untitled')
+                        break
+                
+                # Get due date
+                due = None
+                for prop_value in props.values():
+                    if prop_value is None or not isinstance(prop_value, dict):
+                        continue
+                    if (prop_value.get('type') or '') == 'due':
+                        due_date = prop_value.get('date')
+                        if due_date:
+                            due = due_date.get('start')
+                        break
+                
+                filtered.append({'title': title, 'due': due})
+        
+        return {'tasks': filtered[:15]}
+    
+    except Exception as e:
+        return {'error': f'Configure NOTION_API_KEY in Streamlit Cloud secrets: {str(e)}'}
+
+@timed_cache(ttl=300)
+def fetch_todoist_tasks():
+    """Fetch tasks from Todoist with proper error handling"""
+    settings = get_settings()
+    if not settings.todoist_api_key:
+        return {'error': 'Configure TODOIST_API_KEY in Streamlit Cloud secrets'}
+    
+    try:
+        url = f"{settings.todoist_url}/rest/v2/tasks"
+        
+        headers = {
+            "Authorization": f"Bearer {settings.todoist_api_key}"
+        }
+        
+        params = {"filter": "today | overdue", "limit": 20}
+        
+        response = _send('GET', url, 'todoist', headers=headers, params=params, timeout=10)
+        
+        if response.status_code == 200:
+            tasks = response.json()
+            return {'tasks': [{'title': t.get('content', 'Untitled'), 'due': t.get('due', {}).get('date')} for t in tasks]}
+        else:
+            return {'error': f'Configure TODOIST_API_KEY in Streamlit Cloud secrets'}
+    
+    except Exception as e:
+        return {'error': f'Configure TODOIST_API_KEY in Streamlit Cloud secrets'}
+
+@timed_cache(ttl=60)
+def fetch_kimi_todos():
+    """Parse Kimi's TODOs from markdown file"""
+    try:
+        if not Path(KIMI_TODOS_FILE).exists():
+            return {'active': [], 'completed': []}
+        
+        with open(KIMI_TODOS_FILE, 'r') as f:
+            content = f.read()
+        
+        active = []
+        completed = []
+        
+        lines = content.split('\n')
+        current_section = None
+        
+        for line in lines:
+            line = line.strip()
+            if line == '## Active':
+                current_section = 'active'
+            elif line == '## Completed':
+                current_section = 'completed'
+            elif line.startswith('- [ ]') and current_section == 'active':
+                active.append(line[5:].strip())
+            elif line.startswith('- [x]') and current_section == 'completed':
+                completed.append(line[6:].strip())
+        
+        return {'active': active, 'completed': completed}
+    
+    except Exception as e:
+        return {'error': str(e)}
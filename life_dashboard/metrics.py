@@ -0,0 +1,178 @@
+"""
+Lightweight in-process metrics - timers and counters
+
+One registry per process (shared by every session) feeds the diagnostics
+panel and can be exported in the Prometheus text format.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROMETHEUS_PREFIX = "life_dashboard_"
+
+COUNTER_HELP = {
+    'cache_hits_total': "Cached function calls answered from the cache",
+    'cache_misses_total': "Cached function calls that ran the function",
+    'upstream_requests_total': "Requests sent to an upstream provider",
+    'upstream_errors_total': "Failed upstream requests",
+    'upstream_retries_total': "Upstream retries and fallbacks",
+    'upstream_bytes_total': "Response bytes received from an upstream provider",
+    'section_stale_total': "Sections rendered from stale data after missing their budget",
+    'section_retries_total': "Background retries of failed section fetches",
+    'cache_evictions_total': "Cache entries evicted to stay within a cache's byte budget",
+}
+
+GAUGE_HELP = {
+    'cache_entries': "Entries currently held by a cached function",
+    'cache_bytes': "Estimated deep size of a cached function's entries",
+}
+
+TIMER_HELP = {
+    'call_seconds': "Cached function calls, hits included",
+    'fetch_seconds': "Cached function executions (cache misses)",
+    'upstream_seconds': "Upstream request latency",
+    'section_seconds': "Top-level page section render time",
+}
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key):
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in key) + "}"
+
+
+class Metrics:
+    """Thread-safe counters and timers keyed by name and labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._timers = {}
+
+    def inc(self, name, value=1, **labels):
+        """Add value to a counter"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """Set a gauge to value"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name, seconds, **labels):
+        """Record one timing"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            count, total, longest = self._timers.get(key, (0, 0.0, 0.0))
+            self._timers[key] = (count + 1, total + seconds, max(longest, seconds))
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time the enclosed block, also when it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timers.clear()
+
+    def counters(self):
+        """Counter rows: name, labels and value"""
+        with self._lock:
+            items = sorted(self._counters.items())
+        return [{'name': name, 'labels': dict(key), 'value': value} for (name, key), value in items]
+
+    def gauges(self):
+        """Gauge rows: name, labels and value"""
+        with self._lock:
+            items = sorted(self._gauges.items())
+        return [{'name': name, 'labels': dict(key), 'value': value} for (name, key), value in items]
+
+    def timers(self):
+        """Timer rows: name, labels, count, total, mean and max seconds"""
+        with self._lock:
+            items = sorted(self._timers.items())
+        return [
+            {'name': name, 'labels': dict(key), 'count': count, 'total': total,
+             'mean': total / count, 'max': longest}
+            for (name, key), (count, total, longest) in items
+        ]
+
+    def to_prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            timers = sorted(self._timers.items())
+
+        lines = []
+        seen = set()
+        for (name, key), value in counters:
+            metric = PROMETHEUS_PREFIX + name
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# HELP {metric} {COUNTER_HELP.get(name, name)}")
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(key)} {value}")
+
+        for (name, key), value in gauges:
+            metric = PROMETHEUS_PREFIX + name
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# HELP {metric} {GAUGE_HELP.get(name, name)}")
+                lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric}{_format_labels(key)} {value}")
+
+        for (name, key), (count, total, _) in timers:
+            metric = PROMETHEUS_PREFIX + name
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# HELP {metric} {TIMER_HELP.get(name, name)}")
+                lines.append(f"# TYPE {metric} summary")
+            labels = _format_labels(key)
+            lines.append(f"{metric}_count{labels} {count}")
+            lines.append(f"{metric}_sum{labels} {total:.6f}")
+
+        # Slowest observation per timer, as its own gauge family
+        for (name, key), (_, _, longest) in timers:
+            metric = f"{PROMETHEUS_PREFIX}{name}_max"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# HELP {metric} Slowest observation: {TIMER_HELP.get(name, name)}")
+                lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric}{_format_labels(key)} {longest:.6f}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write the Prometheus text to path atomically (node_exporter textfile collector)"""
+        path = Path(path)
+        # A temp file per writer: app threads, app processes and the snapshot
+        # builder may all export to the same path at once
+        with tempfile.NamedTemporaryFile('w', dir=path.parent, prefix=f".{path.name}.",
+                                         suffix='.tmp', delete=False) as f:
+            f.write(self.to_prometheus())
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+
+
+METRICS = Metrics()
@@ -0,0 +1,281 @@
+"""
+Persistent news archive
+
+Every headline fetch_news() sees is appended to a daily partition under
+NEWS_ARCHIVE_DIR, named after the day the item was published (UTC):
+
+    news_archive/2024-05-01.jsonl       current days, appended to
+    news_archive/2024-04-20.jsonl.gz    older days, compacted
+    news_archive/2024-05-01.index.json  sources and categories of the day
+
+Items are deduplicated by a hash of their GUID (or link). Partitions older
+than NEWS_RETENTION_DAYS are deleted, and days older than
+COMPACT_AFTER_DAYS are rewritten sorted, deduplicated and gzipped. Queries
+only open the partitions inside the requested date range, and queries by
+source or category skip the days whose index lists none of them.
+
+Several processes (app instances, the snapshot builder) share the archive,
+so appends, index updates and compaction of a day hold an flock on the
+day's lock file (news_archive/.2024-05-01.lock).
+"""
+
+import fcntl
+import functools
+import gzip
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from life_dashboard.config import get_settings
+
+# Days are compacted once nothing new is likely to be published for them
+COMPACT_AFTER_DAYS = 2
+
+# Partitions checked for duplicates: items without a publish date land on
+# the day they were fetched, so they can reappear on later days
+DEDUP_WINDOW_DAYS = 7
+
+_lock = threading.Lock()
+_last_maintenance = {}
+
+
+def item_key(guid, link):
+    """Stable identity of a news item: sha1 of its GUID, or of its link"""
+    return hashlib.sha1((guid or link or '').encode()).hexdigest()
+
+
+def _directory(directory=None):
+    return Path(directory or get_settings().news_archive_dir)
+
+
+def _partition_day(path):
+    try:
+        return date.fromisoformat(path.name.split('.')[0])
+    except ValueError:
+        return None
+
+
+@contextmanager
+def _day_lock(directory, day):
+    """Exclusive lock on one day's partitions and index, across processes"""
+    with open(directory / f".{day.isoformat()}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def partitions(start=None, end=None, directory=None):
+    """Partition files for the days in [start, end], oldest first.
+
+    A day can have both a compacted (.jsonl.gz) and a live (.jsonl) file.
+    Only file names are inspected; nothing is opened.
+    """
+    found = []
+    for path in _directory(directory).glob('*.jsonl*'):
+        day = _partition_day(path)
+        if day is None:
+            continue
+        if (start is None or day >= start) and (end is None or day <= end):
+            found.append((day, path))
+    return [path for _, path in sorted(found)]
+
+
+@functools.lru_cache(maxsize=64)
+def _read_cached(path, mtime_ns):
+    opener = gzip.open if path.suffix == '.gz' else open
+    records = []
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # A torn last line from an interrupted append
+                continue
+    return tuple(records)
+
+
+def read_partition(path):
+    """Records of one partition file (cached until the file changes)"""
+    path = Path(path)
+    try:
+        return _read_cached(path, path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        return ()
+
+
+def _index_path(directory, day):
+    return directory / f"{day.isoformat()}.index.json"
+
+
+@functools.lru_cache(maxsize=256)
+def _read_index_cached(path, mtime_ns):
+    with open(path, encoding='utf-8') as f:
+        index = json.load(f)
+    return frozenset(index['sources']), frozenset(index['categories'])
+
+
+def read_index(day, directory=None):
+    """(sources, categories) archived on day, or None if the day has no index"""
+    path = _index_path(_directory(directory), day)
+    try:
+        return _read_index_cached(path, path.stat().st_mtime_ns)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def update_index(day, records, directory=None):
+    """Add the sources and categories of records to day's index.
+
+    A missing index is rebuilt from the day's partitions first. The index is
+    written before the records are appended, so it never lists less than
+    the partitions hold.
+    """
+    directory = _directory(directory)
+    current = read_index(day, directory)
+    if current is None:
+        existing = [record for path in partitions(day, day, directory) for record in read_partition(path)]
+        current = (frozenset(r['source'] for r in existing), frozenset(r['category'] for r in existing))
+    sources = current[0] | {record['source'] for record in records}
+    categories = current[1] | {record['category'] for record in records}
+    path = _index_path(directory, day)
+    if (sources, categories) == current and path.exists():
+        return
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'sources': sorted(sources), 'categories': sorted(categories)}, f)
+    os.replace(tmp_path, path)
+
+
+def _known_keys(days, today, directory):
+    """Item keys already archived on the given days or within the dedup window"""
+    window_start = today - timedelta(days=DEDUP_WINDOW_DAYS)
+    return {
+        record['id']
+        for path in partitions(min([window_start, *days]), directory=directory)
+        if _partition_day(path) >= window_start or _partition_day(path) in days
+        for record in read_partition(path)
+    }
+
+
+def archive_news(items, directory=None, now=None):
+    """Append unseen items to their day's partition; returns how many were new.
+
+    Items are dicts with 'title', 'link', 'source' and 'category', plus an
+    optional 'id' (GUID) and 'published' (ISO timestamp).
+    """
+    directory = _directory(directory)
+    now = now or datetime.now(timezone.utc)
+    fetched = now.isoformat(timespec='seconds')
+    oldest = (now.date() - timedelta(days=get_settings().news_retention_days)).isoformat()
+
+    # Items already past the retention policy are not archived at all
+    items = [
+        dict(item, published=item.get('published') or fetched)
+        for item in items
+        if (item.get('published') or fetched)[:10] >= oldest
+    ]
+    days = {date.fromisoformat(item['published'][:10]) for item in items}
+
+    with _lock:
+        directory.mkdir(parents=True, exist_ok=True)
+        known = _known_keys(days, now.date(), directory)
+        by_day = {}
+        for item in items:
+            key = item_key(item.get('id'), item.get('link'))
+            if key in known:
+                continue
+            known.add(key)
+            published = item['published']
+            record = {
+                'id': key,
+                'title': item.get('title', ''),
+                'link': item.get('link', ''),
+                'source': item.get('source', ''),
+                'category': item.get('category', ''),
+                'published': published,
+                'fetched': fetched,
+            }
+            by_day.setdefault(published[:10], []).append(record)
+
+        for day, records in by_day.items():
+            with _day_lock(directory, date.fromisoformat(day)):
+                update_index(date.fromisoformat(day), records, directory)
+                with open(directory / f"{day}.jsonl", 'a', encoding='utf-8') as f:
+                    f.write("".join(json.dumps(record) + "\n" for record in records))
+
+        if _last_maintenance.get(str(directory)) != now.date():
+            _last_maintenance[str(directory)] = now.date()
+            maintain_archive(directory, today=now.date())
+
+    return sum(len(records) for records in by_day.values())
+
+
+def compact_partition(day, directory=None):
+    """Merge a day's live and compacted files into one sorted, deduplicated .jsonl.gz"""
+    directory = _directory(directory)
+    live = directory / f"{day.isoformat()}.jsonl"
+    compacted = directory / f"{day.isoformat()}.jsonl.gz"
+
+    # Held until the live file is gone, so no append lands between reading
+    # it and unlinking it
+    with _day_lock(directory, day):
+        records = {}
+        for path in (compacted, live):
+            for record in read_partition(path):
+                records.setdefault(record['id'], record)
+        ordered = sorted(records.values(), key=lambda r: r['published'])
+
+        tmp_path = compacted.with_name(f".{compacted.name}.tmp")
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write("".join(json.dumps(record) + "\n" for record in ordered))
+        os.replace(tmp_path, compacted)
+        live.unlink(missing_ok=True)
+
+
+def maintain_archive(directory=None, today=None):
+    """Apply the retention policy, compact days older than COMPACT_AFTER_DAYS
+    and index days archived before the indexes existed"""
+    directory = _directory(directory)
+    today = today or datetime.now(timezone.utc).date()
+    expire_before = today - timedelta(days=get_settings().news_retention_days)
+    last_compacted = today - timedelta(days=COMPACT_AFTER_DAYS + 1)
+
+    for path in partitions(end=last_compacted, directory=directory):
+        day = _partition_day(path)
+        if day < expire_before:
+            path.unlink(missing_ok=True)
+        elif path.suffix == '.jsonl':
+            compact_partition(day, directory)
+
+    for path in [*directory.glob('*.index.json'), *directory.glob('.*.lock')]:
+        day = _partition_day(path.with_name(path.name.lstrip('.')))
+        if day is not None and day < expire_before:
+            path.unlink(missing_ok=True)
+    for day in {_partition_day(path) for path in partitions(directory=directory)}:
+        if read_index(day, directory) is None:
+            with _day_lock(directory, day):
+                update_index(day, [], directory)
+
+
+def query_news(start=None, end=None, sources=None, categories=None, limit=None, directory=None):
+    """Archived items published between start and end (dates, inclusive), newest first"""
+    results = {}
+    for path in partitions(start, end, directory):
+        index = read_index(_partition_day(path), directory) if sources or categories else None
+        if index is not None:
+            if sources and not index[0] & set(sources):
+                continue
+            if categories and not index[1] & set(categories):
+                continue
+        for record in read_partition(path):
+            if sources and record['source'] not in sources:
+                continue
+            if categories and record['category'] not in categories:
+                continue
+            results.setdefault(record['id'], record)
+    ordered = sorted(results.values(), key=lambda r: r['published'], reverse=True)
+    return ordered[:limit] if limit else ordered
@@ -0,0 +1,179 @@
+"""
+Near-duplicate headline clustering
+
+The same story is often carried by several feeds (and by both the general
+and market categories) with slightly different titles. Each title gets a
+MinHash signature over its words; an LSH index splits signatures into
+bands, so a new headline is only compared with the earlier headlines that
+share a band - constant work per headline instead of a pass over every
+stored title. Candidates are confirmed with the exact word Jaccard
+similarity.
+
+MinHash rather than SimHash: headlines are a handful of words, too short
+for SimHash's bit-distance to separate rewordings from different stories.
+
+One index lives for the whole process and forgets clusters that have not
+been seen for CLUSTER_MAX_AGE, so a story keeps its cluster across feed
+refreshes. A second one filters what fetch_news() archives, so the archive
+keeps one report of each story rather than one per feed.
+"""
+
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Signature length and LSH layout: 16 bands of 2 rows make a pair with
+# Jaccard 0.5 a candidate with ~99% probability
+NUM_PERM = 32
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Titles at least this similar (word Jaccard) are the same story
+SIMILARITY_THRESHOLD = 0.6
+
+# Seconds a cluster is remembered after its last headline was seen
+CLUSTER_MAX_AGE = 2 * 86400
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or "
+    "over the to up was were will with after amid".split()
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def title_tokens(title):
+    """Lower-cased words of a title, without stopwords"""
+    words = _WORD.findall(title.lower())
+    return frozenset(word for word in words if word not in STOPWORDS) or frozenset(words)
+
+
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little')
+
+
+def minhash(tokens):
+    """MinHash signature (NUM_PERM ints) of a token set"""
+    hashes = [_token_hash(token) for token in tokens] or [0]
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def jaccard(left, right):
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+class HeadlineIndex:
+    """Incremental LSH index of headline clusters.
+
+    With max_age (seconds), clusters whose last headline is older than that
+    are dropped, so an index that lives across fetches stays small. Safe to
+    share between threads.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, max_age=None):
+        self.threshold = threshold
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._clusters = {}
+        # cluster -> when its last headline was seen, least recent first
+        self._last_seen = OrderedDict()
+        self._next_cluster = 0
+
+    def _expire(self, now):
+        if self.max_age is None:
+            return
+        while self._last_seen:
+            cluster, seen = next(iter(self._last_seen.items()))
+            if now - seen < self.max_age:
+                break
+            del self._last_seen[cluster]
+            _, bands = self._clusters.pop(cluster)
+            for key in bands:
+                bucket = self._buckets[key]
+                bucket.remove(cluster)
+                if not bucket:
+                    del self._buckets[key]
+
+    def add(self, title, now=None):
+        """(cluster id, new) of title: an earlier similar headline's cluster, or a new one"""
+        now = time.time() if now is None else now
+        tokens = title_tokens(title)
+        signature = minhash(tokens)
+        bands = [(band, signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+        with self._lock:
+            self._expire(now)
+            candidates = set()
+            for key in bands:
+                candidates.update(self._buckets.get(key, ()))
+            for cluster in sorted(candidates):
+                if jaccard(tokens, self._clusters[cluster][0]) >= self.threshold:
+                    self._last_seen[cluster] = now
+                    self._last_seen.move_to_end(cluster)
+                    return cluster, False
+
+            cluster = self._next_cluster
+            self._next_cluster += 1
+            self._clusters[cluster] = (tokens, bands)
+            self._last_seen[cluster] = now
+            for key in bands:
+                self._buckets.setdefault(key, []).append(cluster)
+            return cluster, True
+
+    def __len__(self):
+        return len(self._clusters)
+
+
+# Shared by every fetch in this process: headlines shown and headlines archived
+_shown = HeadlineIndex(max_age=CLUSTER_MAX_AGE)
+_archived = HeadlineIndex(max_age=CLUSTER_MAX_AGE)
+
+
+def dedupe_news(news_data, index=None):
+    """Drop near-duplicate headlines across every category.
+
+    The first occurrence (categories and feeds in RSS_FEEDS order) is kept;
+    the sources of its duplicates are listed in its 'also' field. Headlines
+    are clustered with the process-wide index unless one is given.
+    """
+    if index is None:
+        index = _shown
+    kept = {}
+    result = {category: [] for category in news_data}
+    for category, items in news_data.items():
+        for item in items:
+            cluster, _ = index.add(item['title'])
+            first = kept.get(cluster)
+            if first is None:
+                kept[cluster] = item = dict(item, also=[])
+                result[category].append(item)
+            elif item['source'] != first['source'] and item['source'] not in first['also']:
+                first['also'].append(item['source'])
+    return result
+
+
+def new_stories(items, index=None):
+    """The items whose headline is not a near-duplicate of one seen before.
+
+    Earlier items in the list and earlier calls count, through the
+    process-wide archive index unless one is given.
+    """
+    if index is None:
+        index = _archived
+    return [item for item in items if index.add(item['title'])[1]]
@@ -0,0 +1,162 @@
+"""
+Related ideas and decisions
+
+Every idea and decision is a row of hashed n-gram term counts (word
+unigrams and bigrams, character trigrams) in one sparse CSR matrix. Rows
+are appended in place - the CSR arrays grow by doubling - and document
+frequencies are updated with each new row, so adding an entry never
+rebuilds the index.
+
+Similarity is TF-IDF cosine computed for all rows at once: the IDF weights
+are applied at query time (one sparse matrix-vector product), and the top
+k come from np.argpartition, so lookups stay in milliseconds at tens of
+thousands of entries.
+"""
+
+import hashlib
+import re
+import threading
+
+import numpy as np
+from scipy import sparse
+
+# Hashed feature space; collisions only blur scores slightly
+N_FEATURES = 1 << 18
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def ngrams(text):
+    """Word unigrams and bigrams plus character trigrams of each word"""
+    words = _WORD.findall(text.lower())
+    grams = list(words)
+    grams += [f"{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f"<{word}>"
+        grams += [f"#{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return grams
+
+
+def _feature(gram):
+    return int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), 'little') % N_FEATURES
+
+
+def entry_text(kind, row):
+    """Indexed text of a Supabase idea or decision row"""
+    return f"{row.get(kind, '') or ''} {row.get('context', '') or ''}".strip()
+
+
+def entry_key(kind, row):
+    return (kind, row.get('id') or row.get('created_at') or entry_text(kind, row))
+
+
+class RelatedIndex:
+    """Incrementally built TF-IDF index over ideas and decisions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []
+        self._positions = {}
+        self._entries = []
+        self._indptr = np.zeros(1024, dtype=np.int64)
+        self._indices = np.zeros(1024, dtype=np.int32)
+        self._data = np.zeros(1024, dtype=np.float32)
+        self._nnz = 0
+        self._df = np.zeros(N_FEATURES, dtype=np.int32)
+        self._last_ids = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def last_id(self, kind):
+        """Highest Supabase id indexed for kind, or None"""
+        return self._last_ids.get(kind)
+
+    @staticmethod
+    def _grown(array, needed):
+        """array, or a copy with doubled capacity when it cannot hold `needed` items"""
+        capacity = len(array)
+        if needed <= capacity:
+            return array
+        while capacity < needed:
+            capacity *= 2
+        return np.resize(array, capacity)
+
+    def _vector(self, text):
+        """(feature indices, sublinear term frequencies) of text"""
+        features = np.fromiter((_feature(gram) for gram in ngrams(text)), dtype=np.int64)
+        indices, counts = np.unique(features, return_counts=True)
+        return indices.astype(np.int32), (1 + np.log(counts)).astype(np.float32)
+
+    def add(self, kind, row):
+        """Index one idea or decision row; already indexed rows are ignored"""
+        key = entry_key(kind, row)
+        indices, weights = self._vector(entry_text(kind, row))
+        with self._lock:
+            if key in self._positions:
+                return
+            start = self._nnz
+            rows = len(self._keys)
+            # Arrays are replaced, never resized in place, so a matrix
+            # snapshot taken earlier stays valid
+            self._indices = self._grown(self._indices, start + len(indices))
+            self._data = self._grown(self._data, start + len(indices))
+            self._indptr = self._grown(self._indptr, rows + 2)
+            self._indices[start:start + len(indices)] = indices
+            self._data[start:start + len(indices)] = weights
+            self._nnz += len(indices)
+            self._indptr[rows + 1] = self._nnz
+            self._df[indices] += 1
+            self._positions[key] = len(self._keys)
+            self._keys.append(key)
+            if isinstance(row.get('id'), int):
+                self._last_ids[kind] = max(self._last_ids.get(kind, 0), row['id'])
+            self._entries.append({'kind': kind, 'text': row.get(kind, ''), 'created_at': row.get('created_at', '')})
+
+    def sync(self, kind, rows):
+        """Index the rows that are not in the index yet"""
+        for row in rows:
+            if entry_key(kind, row) not in self._positions:
+                self.add(kind, row)
+
+    def _snapshot(self):
+        with self._lock:
+            n = len(self._keys)
+            matrix = sparse.csr_matrix(
+                (self._data[:self._nnz], self._indices[:self._nnz], self._indptr[:n + 1]),
+                shape=(n, N_FEATURES)
+            )
+            df = self._df.copy()
+            entries = list(self._entries)
+        return matrix, df, entries
+
+    def similar(self, text, k=5, exclude=None):
+        """Top k entries by TF-IDF cosine similarity to text: (entry, score) pairs"""
+        matrix, df, entries = self._snapshot()
+        if not entries:
+            return []
+        idf = np.log((1 + len(entries)) / (1 + df)).astype(np.float32) + 1
+        indices, weights = self._vector(text)
+        if not len(indices):
+            return []
+
+        query = np.zeros(N_FEATURES, dtype=np.float32)
+        query[indices] = weights * idf[indices] ** 2
+        query_norm = np.sqrt(np.sum((weights * idf[indices]) ** 2))
+        row_norms = np.sqrt(matrix.power(2) @ (idf ** 2))
+        scores = (matrix @ query) / np.maximum(row_norms * query_norm, 1e-12)
+
+        position = self._positions.get(exclude)
+        if position is not None and position < len(scores):
+            scores[position] = -1
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(entries[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def related(self, kind, row, k=5):
+        """Entries most similar to an indexed (or new) row, excluding itself"""
+        return self.similar(entry_text(kind, row), k, exclude=entry_key(kind, row))
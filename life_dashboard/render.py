@@ -0,0 +1,133 @@
+"""
+Batched render helpers
+
+Each helper turns a whole list into one markdown/HTML block so a section is a
+single Streamlit element (one websocket delta) instead of one element per
+item. The builders are plain functions: building a string takes microseconds,
+far less than hashing the input for a cache lookup would.
+"""
+
+import html
+from datetime import datetime
+
+import streamlit as st
+
+# Small gray text, matching st.caption
+CAPTION_STYLE = "color: rgba(250, 250, 250, 0.6); font-size: 0.875rem;"
+
+
+def format_timestamp(ts):
+    """Format an ISO timestamp as 'YYYY-MM-DD HH:MM', or return it unchanged"""
+    try:
+        dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+        return dt.strftime('%Y-%m-%d %H:%M')
+    except:
+        return ts
+
+
+def news_markdown(items):
+    """Markdown list of news headlines with their source (and duplicates' sources)"""
+    return "\n".join(
+        f"- [{item['title']}]({item['link']})  \n  *{item['source']}*"
+        + (f" · also {', '.join(item['also'])}" if item.get('also') else "")
+        for item in items
+    )
+
+
+def forecast_html(forecast):
+    """One row of day / icon / high-low cells for the daily forecast"""
+    cells = "".join(
+        f"<div style='text-align: center; flex: 1;'>"
+        f"<b>{day['day']}</b><br>{day['icon']}<br>{day['high']}°/{day['low']}°"
+        f"</div>"
+        for day in forecast
+    )
+    return f"<div style='display: flex; {CAPTION_STYLE}'>{cells}</div>"
+
+
+def entries_markdown(entries, text_key):
+    """Timestamped decision/idea entries with their optional context"""
+    lines = []
+    for entry in entries:
+        date_str = format_timestamp(entry.get('created_at', ''))
+        lines.append(f"**{date_str}**: {html.escape(entry.get(text_key, '') or '')}")
+        if entry.get('context'):
+            lines.append(f"<div style='{CAPTION_STYLE}'>Context: {html.escape(entry['context'])}</div>")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def mood_entries_markdown(moods):
+    """Recent mood entries, one line each"""
+    lines = []
+    for m in moods:
+        note_text = f" - *{m['note']}*" if m['note'] else ""
+        lines.append(f"**{m['date']}**: {m['emoji']} {m['mood']}{note_text}  ")
+    return "\n".join(lines)
+
+
+def trends_markdown(trends, unit):
+    """Markdown table of watchlist trends (see stock_history.watchlist_trends)"""
+    def percent(value):
+        return f"{value * 100:+.1f}%" if value is not None else "–"
+
+    def price(value):
+        return f"{value:,.2f}" if value is not None else "–"
+
+    if not trends:
+        return ""
+    periods = list(trends[0]['returns'])
+    windows = list(trends[0]['sma'])
+    header = (["Ticker", "Price"] + [f"{p}{unit}" for p in periods]
+              + [f"SMA {w}" for w in windows] + ["Volatility", "Trend"])
+    lines = [
+        "| " + " | ".join(header) + " |",
+        "|" + "|".join(["---"] + ["---:"] * (len(header) - 2) + ["---"]) + "|",
+    ]
+    for t in trends:
+        cells = ([f"**{t['ticker']}**", price(t['price'])]
+                 + [percent(t['returns'][p]) for p in periods]
+                 + [price(t['sma'][w]) for w in windows]
+                 + [percent(t['volatility']), f"`{t['sparkline']}`"])
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def related_markdown(matches):
+    """Related ideas/decisions with their similarity, one line each"""
+    icons = {'idea': "💡", 'decision': "📝"}
+    return "\n".join(
+        f"- {icons.get(entry['kind'], '')} {html.escape(entry['text'] or '')} "
+        f"<span style='{CAPTION_STYLE}'>{format_timestamp(entry['created_at'])} · {score:.0%}</span>"
+        for entry, score in matches
+    )
+
+
+def render_news(items):
+    """Render a news list as a single markdown element"""
+    st.markdown(news_markdown(items))
+
+
+def render_forecast(forecast):
+    """Render the daily forecast as a single HTML element"""
+    st.markdown(forecast_html(forecast), unsafe_allow_html=True)
+
+
+def render_entries(entries, text_key):
+    """Render decisions or ideas as a single markdown element"""
+    st.markdown(entries_markdown(entries, text_key), unsafe_allow_html=True)
+
+
+def render_mood_entries(moods):
+    """Render recent mood entries as a single markdown element"""
+    st.markdown(mood_entries_markdown(moods))
+
+
+def render_related(matches):
+    """Render related ideas/decisions as a single markdown element"""
+    st.markdown(related_markdown(matches), unsafe_allow_html=True)
+
+
+def render_trends(trends, unit):
+    """Render watchlist trends as a single markdown table"""
+    st.markdown(trends_markdown(trends, unit))
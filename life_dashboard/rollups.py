@@ -0,0 +1,202 @@
+"""
+Daily and weekly mood rollups
+
+Mood entries are aggregated per America/New_York day - entry count, mood
+score sum, first and last entry - in a local SQLite table, so charts read
+a few hundred aggregate rows instead of the raw history. Weeks (Monday
+start) are a view over the days.
+
+catch_up() applies the rows with an id above the last one already counted -
+after a save, usually just the new one. The app runs it in a background
+section right after each save and whenever its cached rollups expire, which
+also picks up entries saved by other app instances. Updates take SQLite's
+write lock before reading the last id, so processes sharing the database
+never count a row twice. On Supabase the mood_daily / mood_weekly views
+from SUPABASE_SETUP.md compute the same rows server-side
+(ROLLUP_SOURCE=supabase).
+
+Rebuild the local rollup from scratch:
+    python -m life_dashboard.rollups backfill
+"""
+
+import argparse
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from life_dashboard.config import EASTERN, get_settings
+from life_dashboard.db import create_supabase_client, iter_rows, normalize_timestamp, run_query
+
+# Mood label -> score (the app's current labels, plus the legacy ones)
+MOOD_SCORES = {
+    'sad': 1, 'down': 2, 'neutral': 3, 'good': 4, 'happy': 5, 'great': 6,
+    'awful': 1, 'bad': 2, 'okay': 3, 'amazing': 6,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mood_daily (
+    day TEXT PRIMARY KEY,
+    entries INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    scored INTEGER NOT NULL,
+    first_at TEXT NOT NULL,
+    first_mood TEXT,
+    last_at TEXT NOT NULL,
+    last_mood TEXT
+);
+
+CREATE TABLE IF NOT EXISTS rollup_state (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE VIEW IF NOT EXISTS mood_daily_weeks AS
+SELECT *, date(day, '-' || ((CAST(strftime('%w', day) AS INTEGER) + 6) % 7) || ' days') AS week
+FROM mood_daily;
+
+-- SQLite takes bare columns from the MIN()/MAX() row of each group
+CREATE VIEW IF NOT EXISTS mood_weekly AS
+SELECT totals.week AS day, entries, score_sum, scored, first_at, first_mood, last_at, last_mood
+FROM (SELECT week, SUM(entries) AS entries, SUM(score_sum) AS score_sum, SUM(scored) AS scored
+      FROM mood_daily_weeks GROUP BY week) AS totals
+JOIN (SELECT week, MIN(first_at) AS first_at, first_mood FROM mood_daily_weeks GROUP BY week) USING (week)
+JOIN (SELECT week, MAX(last_at) AS last_at, last_mood FROM mood_daily_weeks GROUP BY week) USING (week);
+"""
+
+UPSERT = """
+INSERT INTO mood_daily (day, entries, score_sum, scored, first_at, first_mood, last_at, last_mood)
+VALUES (:day, 1, :score, :scored, :at, :mood, :at, :mood)
+ON CONFLICT (day) DO UPDATE SET
+    entries = entries + 1,
+    score_sum = score_sum + excluded.score_sum,
+    scored = scored + excluded.scored,
+    first_mood = CASE WHEN excluded.first_at < first_at THEN excluded.first_mood ELSE first_mood END,
+    first_at = MIN(first_at, excluded.first_at),
+    last_mood = CASE WHEN excluded.last_at > last_at THEN excluded.last_mood ELSE last_mood END,
+    last_at = MAX(last_at, excluded.last_at)
+"""
+
+COLUMNS = ['day', 'entries', 'score_sum', 'scored', 'first_at', 'first_mood', 'last_at', 'last_mood']
+
+_initialized = set()
+_catch_up_lock = threading.Lock()
+
+
+def local_day(created_at):
+    """America/New_York date ('YYYY-MM-DD') of a created_at timestamp"""
+    utc = datetime.fromisoformat(normalize_timestamp(created_at))
+    return utc.astimezone(EASTERN).date().isoformat()
+
+
+def connect(path=None):
+    """Connection to the rollup database, creating the schema on first use"""
+    path = path or get_settings().rollup_db
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if path not in _initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        _initialized.add(path)
+    return conn
+
+
+def _last_id(conn):
+    row = conn.execute("SELECT value FROM rollup_state WHERE name = 'last_id'").fetchone()
+    return row['value'] if row else 0
+
+
+def apply_rows(conn, rows):
+    """Add mood rows (in id order) to the daily rollup; returns how many were new"""
+    last_id = _last_id(conn)
+    applied = 0
+    for row in rows:
+        if row.get('id') is None or row['id'] <= last_id or not row.get('created_at'):
+            continue
+        score = MOOD_SCORES.get(row.get('mood'))
+        conn.execute(UPSERT, {
+            'day': local_day(row['created_at']),
+            'score': score or 0,
+            'scored': 1 if score else 0,
+            'at': normalize_timestamp(row['created_at']),
+            'mood': row.get('mood'),
+        })
+        last_id = row['id']
+        applied += 1
+    conn.execute(
+        "INSERT INTO rollup_state (name, value) VALUES ('last_id', ?) "
+        "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+        (last_id,)
+    )
+    return applied
+
+
+def catch_up(client, path=None):
+    """Apply every mood entry saved since the last one counted"""
+    with _catch_up_lock, closing(connect(path)) as conn:
+        with conn:
+            # Other processes wait here until this transaction commits, then
+            # read the last_id it wrote
+            conn.execute("BEGIN IMMEDIATE")
+            rows = iter_rows(client, 'mood_entries', columns='id,mood,created_at', after_id=_last_id(conn))
+            return apply_rows(conn, rows)
+
+
+def backfill(client, path=None):
+    """Rebuild the rollup from the whole mood history"""
+    with _catch_up_lock, closing(connect(path)) as conn:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM mood_daily")
+            conn.execute("DELETE FROM rollup_state")
+            return apply_rows(conn, iter_rows(client, 'mood_entries', columns='id,mood,created_at'))
+
+
+def _as_rollup(row):
+    row = dict(row)
+    row['mean'] = row['score_sum'] / row['scored'] if row['scored'] else None
+    return row
+
+
+def mood_rollups(start, end, period='day', client=None, path=None):
+    """Aggregates for the days (or Monday-start weeks) between start and end, oldest first.
+
+    Each row has day, entries, mean (score), first_at/first_mood and
+    last_at/last_mood. With ROLLUP_SOURCE=supabase they are read from the
+    Supabase views instead of the local database.
+    """
+    table = 'mood_daily' if period == 'day' else 'mood_weekly'
+    if period != 'day':
+        # Weeks are keyed by their Monday; include the week `start` falls in
+        start -= timedelta(days=start.weekday())
+    if get_settings().rollup_source == 'supabase' and client is not None:
+        query = client.table(table).select(','.join(COLUMNS)) \
+            .gte('day', start.isoformat()).lte('day', end.isoformat()).order('day')
+        return [_as_rollup(row) for row in run_query(query).data or []]
+
+    with closing(connect(path)) as conn:
+        rows = conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM {table} WHERE day BETWEEN ? AND ? ORDER BY day",
+            (start.isoformat(), end.isoformat())
+        ).fetchall()
+    return [_as_rollup(row) for row in rows]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the local mood rollups")
+    parser.add_argument('command', choices=['backfill', 'catch-up'],
+                        help="backfill rebuilds from scratch; catch-up adds new entries only")
+    parser.add_argument('--db', help="Rollup database (default: ROLLUP_DB or rollups.sqlite)")
+    args = parser.parse_args(argv)
+
+    client = create_supabase_client()
+    if client is None:
+        raise SystemExit("Supabase is not configured (SUPABASE_URL / SUPABASE_ANON_KEY)")
+    if args.command == 'backfill':
+        print(f"Rolled up {backfill(client, args.db)} mood entries")
+    else:
+        print(f"Added {catch_up(client, args.db)} new mood entries")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""
+Headless dashboard snapshot builder
+
+Runs the upstream fetchers out of the request path and writes one versioned
+JSON snapshot per run. The Streamlit app only reads the latest snapshot, so
+any number of app workers can share a single set of upstream requests.
+
+Run once (cron):
+    python -m life_dashboard.snapshot
+
+Run forever, every 10 minutes (systemd):
+    python -m life_dashboard.snapshot --interval 10
+
+Each run also appends new candles to the stock history (when a Finnhub key
+is configured).
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from life_dashboard.config import get_settings
+from life_dashboard.fetchers import (
+    fetch_kimi_todos,
+    fetch_news,
+    fetch_notion_tasks,
+    fetch_stocks,
+    fetch_todoist_tasks,
+    fetch_weather,
+)
+from life_dashboard.metrics import METRICS
+
+# Bump when the layout of a snapshot changes; readers ignore other versions
+SNAPSHOT_SCHEMA = 1
+
+# Pointer file holding the name of the newest complete snapshot
+LATEST_POINTER = "LATEST"
+
+SNAPSHOT_SECTIONS = {
+    'weather': fetch_weather,
+    'news': fetch_news,
+    'stocks': fetch_stocks,
+    'notion_tasks': fetch_notion_tasks,
+    'todoist_tasks': fetch_todoist_tasks,
+    'kimi_todos': fetch_kimi_todos,
+}
+
+# Last snapshot read by this process: (pointer mtime, snapshot)
+_latest_cache = {}
+
+
+def _write_atomic(path, data):
+    """Write bytes to path so readers never see a partial file"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def latest_snapshot_path(directory=None):
+    """Path of the newest complete snapshot, or None"""
+    directory = directory or get_settings().snapshot_dir
+    pointer = Path(directory) / LATEST_POINTER
+    try:
+        name = pointer.read_text().strip()
+    except OSError:
+        return None
+    return Path(directory) / name if name else None
+
+
+def build_snapshot(sequence):
+    """Run every fetcher and collect the results into one snapshot dict"""
+    sections = {}
+    errors = {}
+    for name, fetcher in SNAPSHOT_SECTIONS.items():
+        # Always go upstream: call the undecorated fetcher, which also keeps
+        # st.cache_data (and its "No runtime found" warnings) out of the CLI
+        try:
+            with METRICS.timer('fetch_seconds', fn=fetcher.__name__):
+                sections[name] = fetcher.__wrapped__()
+        except Exception as e:
+            errors[name] = str(e)
+
+    return {
+        'schema': SNAPSHOT_SCHEMA,
+        'sequence': sequence,
+        'generated_at': time.time(),
+        'sections': sections,
+        'errors': errors
+    }
+
+
+def write_snapshot(snapshot, directory=None, keep=5):
+    """Write a snapshot, point LATEST at it and prune all but the newest `keep`"""
+    directory = Path(directory or get_settings().snapshot_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    path = directory / f"snapshot-{snapshot['sequence']:08d}.json"
+    _write_atomic(path, json.dumps(snapshot).encode())
+    _write_atomic(directory / LATEST_POINTER, path.name.encode())
+
+    for old in sorted(directory.glob("snapshot-*.json"))[:-keep]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+    return path
+
+
+def next_sequence(directory=None):
+    """Sequence number for the next snapshot in directory"""
+    path = latest_snapshot_path(directory)
+    if path is None:
+        return 1
+    try:
+        return int(path.stem.split('-')[1]) + 1
+    except (IndexError, ValueError):
+        return 1
+
+
+def load_latest_snapshot(directory=None, max_age=None):
+    """Load the newest snapshot, re-reading it only when a new one is published.
+
+    Returns None if there is no readable snapshot, it has an unknown schema,
+    or it is older than max_age seconds.
+    """
+    directory = directory or get_settings().snapshot_dir
+    pointer = Path(directory) / LATEST_POINTER
+    try:
+        pointer_mtime = pointer.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _latest_cache.get(str(directory))
+    if cached and cached[0] == pointer_mtime:
+        snapshot = cached[1]
+    else:
+        path = latest_snapshot_path(directory)
+        if path is None:
+            return None
+        try:
+            # Parsed once per published snapshot, then served from _latest_cache
+            snapshot = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        _latest_cache[str(directory)] = (pointer_mtime, snapshot)
+
+    if snapshot.get('schema') != SNAPSHOT_SCHEMA:
+        return None
+    if max_age is not None and time.time() - snapshot.get('generated_at', 0) > max_age:
+        return None
+    return snapshot
+
+
+def run_once(directory, keep):
+    """Build and publish one snapshot"""
+    started = time.monotonic()
+    snapshot = build_snapshot(next_sequence(directory))
+    path = write_snapshot(snapshot, directory, keep)
+    elapsed = time.monotonic() - started
+    print(f"{datetime.now().isoformat(timespec='seconds')} wrote {path} in {elapsed:.1f}s")
+    for name, error in snapshot['errors'].items():
+        print(f"  {name} failed: {error}")
+
+    if get_settings().finnhub_api_key:
+        # Imported here: the app imports this module, and numpy is only
+        # needed by the builder
+        from life_dashboard.stock_history import update_history
+        history = update_history()
+        print(f"  stock history: {history['added']} new candles")
+        for name, error in history['errors'].items():
+            print(f"  stock history {name} failed: {error}")
+
+    metrics_file = get_settings().metrics_file
+    if metrics_file:
+        METRICS.write_prometheus(metrics_file)
+
+
+def main(argv=None):
+    # There is no Streamlit runtime here, and st.cache_data warns about that
+    # every time a cached function (e.g. the trend cache update_history
+    # clears) touches its storage
+    logging.getLogger('streamlit.runtime.caching.cache_data_api').setLevel(logging.ERROR)
+
+    snapshot_dir = get_settings().snapshot_dir
+    parser = argparse.ArgumentParser(description="Build Life Dashboard snapshots")
+    parser.add_argument('--output-dir', default=snapshot_dir,
+                        help=f"Snapshot directory (default: {snapshot_dir})")
+    parser.add_argument('--interval', type=float, default=0,
+                        help="Rebuild every N minutes; 0 builds once and exits (default: 0)")
+    parser.add_argument('--keep', type=int, default=5,
+                        help="Number of snapshots to keep (default: 5)")
+    args = parser.parse_args(argv)
+
+    if args.keep < 1:
+        parser.error("--keep must be at least 1")
+
+    if args.interval <= 0:
+        run_once(args.output_dir, args.keep)
+        return
+
+    while True:
+        started = time.monotonic()
+        try:
+            run_once(args.output_dir, args.keep)
+        except Exception as e:
+            print(f"Snapshot build failed: {e}")
+        time.sleep(max(0.0, args.interval * 60 - (time.monotonic() - started)))
+
+
+if __name__ == '__main__':
+    main()
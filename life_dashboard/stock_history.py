@@ -0,0 +1,301 @@
+"""
+Columnar stock price history
+
+Daily and hourly Finnhub candles for every watchlist ticker are kept in one
+.npy file per ticker and resolution under STOCK_HISTORY_DIR. Updates only
+ask Finnhub for candles newer than the last one on disk and write them at
+the end of the file, growing the shape in its header; the file is only
+rewritten once enough old candles have fallen out of the lookback window.
+Reads memory-map the files, and the trend indicators for the whole
+watchlist are computed in one pass with vectorized NumPy, so rendering
+trends never goes upstream.
+
+The snapshot builder keeps the history current; the app reads it.
+"""
+
+import fcntl
+import io
+import os
+import time
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from life_dashboard.caching import timed_cache
+from life_dashboard.config import STOCK_CATEGORIES, get_settings
+from life_dashboard.fetchers import fetch_candles
+
+# One row per candle: unix time, open, high, low, close, volume
+CANDLE_DTYPE = np.dtype([
+    ('t', '<i8'), ('o', '<f8'), ('h', '<f8'), ('l', '<f8'), ('c', '<f8'), ('v', '<f8'),
+])
+
+# Finnhub resolution -> how much history to keep, how often to refresh it
+# (seconds) and how many candles make a trading year (for volatility)
+RESOLUTIONS = {
+    'D': {'label': 'Daily', 'unit': 'd', 'lookback_days': 365, 'refresh': 6 * 3600, 'per_year': 252},
+    '60': {'label': 'Hourly', 'unit': 'h', 'lookback_days': 30, 'refresh': 3600, 'per_year': 252 * 7},
+}
+
+# Indicator windows, in candles
+RETURN_PERIODS = (1, 5, 20)
+SMA_WINDOWS = (20, 50)
+VOLATILITY_WINDOW = 20
+SPARKLINE_WIDTH = 30
+
+SPARK_CHARS = np.array(list(" ▁▂▃▄▅▆▇█"))
+
+
+def watchlist():
+    """(category, ticker) for every ticker in STOCK_CATEGORIES"""
+    return [(category, ticker) for category, tickers in STOCK_CATEGORIES.items() for ticker in tickers]
+
+
+def history_path(ticker, resolution, directory=None):
+    return Path(directory or get_settings().stock_history_dir) / resolution / f"{ticker}.npy"
+
+
+def load_candles(ticker, resolution='D', directory=None):
+    """Stored candles for ticker, oldest first (read-only memory map)"""
+    path = history_path(ticker, resolution, directory)
+    try:
+        return np.load(path, mmap_mode='r')
+    except FileNotFoundError:
+        return np.empty(0, dtype=CANDLE_DTYPE)
+    except ValueError:
+        # Zero-length arrays cannot be memory-mapped
+        return np.load(path)
+
+
+def _to_candles(columns):
+    candles = np.empty(len(columns['t']), dtype=CANDLE_DTYPE)
+    for key in CANDLE_DTYPE.names:
+        candles[key] = columns[key]
+    return candles
+
+
+def _save_atomic(path, array):
+    """np.save to path so readers (and their memory maps) never see a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def _locked(path):
+    """Hold an exclusive lock on path's history file (across processes)"""
+    with open(path.with_name(f".{path.name}.lock"), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_in_place(path, start, candles):
+    """Write candles over rows start.. of the .npy file and grow its header's shape.
+
+    Returns False if the file is missing or its header cannot be rewritten
+    at the same length. The rows go in before the header, so readers see
+    either the old or the new number of rows.
+    """
+    try:
+        f = open(path, 'r+b')
+    except FileNotFoundError:
+        return False
+    with f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            write_header = np.lib.format.write_array_header_1_0
+        elif version == (2, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            write_header = np.lib.format.write_array_header_2_0
+        else:
+            return False
+        if dtype != CANDLE_DTYPE or fortran_order or len(shape) != 1 or start > shape[0]:
+            return False
+        data_offset = f.tell()
+
+        # np.save pads the header so the shape can grow without moving the data
+        header = io.BytesIO()
+        write_header(header, {
+            'descr': np.lib.format.dtype_to_descr(CANDLE_DTYPE),
+            'fortran_order': False,
+            'shape': (start + len(candles),),
+        })
+        if header.tell() != data_offset:
+            return False
+
+        f.seek(data_offset + start * CANDLE_DTYPE.itemsize)
+        f.write(candles.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+        f.seek(0)
+        f.write(header.getvalue())
+        f.flush()
+        os.fsync(f.fileno())
+    return True
+
+
+def append_candles(ticker, resolution, candles, directory=None):
+    """Merge new candles into the stored history; returns the number of new rows.
+
+    Stored candles at or after the first new one are replaced, so a partial
+    (still forming) candle is overwritten by its final version.
+    """
+    if not len(candles):
+        return 0
+    candles = np.sort(candles, order='t')
+    path = history_path(ticker, resolution, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with _locked(path):
+        existing = load_candles(ticker, resolution, directory)
+        if len(existing):
+            added = int(np.count_nonzero(candles['t'] > existing['t'][-1]))
+        else:
+            added = len(candles)
+        kept = int(np.searchsorted(existing['t'], candles['t'][0]))
+        cutoff = candles['t'][-1] - RESOLUTIONS[resolution]['lookback_days'] * 86400
+        expired = int(np.searchsorted(existing['t'][:kept], cutoff))
+
+        # Never shrink the file in place - readers may have it memory-mapped
+        if kept + len(candles) >= len(existing) and expired <= len(existing) // 10:
+            if _write_in_place(path, kept, candles):
+                return added
+
+        merged = np.concatenate([np.asarray(existing[expired:kept]), candles])
+        _save_atomic(path, merged[merged['t'] >= cutoff])
+    return added
+
+
+def update_history(resolutions=None, directory=None, force=False):
+    """Fetch the candles each ticker is missing and append them.
+
+    Files refreshed more recently than their resolution's refresh interval
+    are skipped unless force is set. Returns {'added': rows, 'errors': {...}}.
+    """
+    settings = get_settings()
+    if not settings.finnhub_api_key:
+        return {'added': 0, 'errors': {'finnhub': 'FINNHUB_API_KEY is not configured'}}
+
+    now = time.time()
+    added = 0
+    errors = {}
+    for resolution in resolutions or RESOLUTIONS:
+        config = RESOLUTIONS[resolution]
+        for _, ticker in watchlist():
+            path = history_path(ticker, resolution, directory)
+            try:
+                if not force and now - path.stat().st_mtime < config['refresh']:
+                    continue
+            except FileNotFoundError:
+                pass
+
+            stored = load_candles(ticker, resolution, directory)
+            start = stored['t'][-1] if len(stored) else now - config['lookback_days'] * 86400
+            try:
+                candles = _to_candles(fetch_candles(ticker, resolution, start, now))
+                added += append_candles(ticker, resolution, candles, directory)
+            except Exception as e:
+                errors[f"{ticker}/{resolution}"] = str(e)
+
+    watchlist_trends.clear()
+    return {'added': added, 'errors': errors}
+
+
+def close_matrix(tickers, resolution, length, directory=None):
+    """Last `length` closes of every ticker as one (tickers x length) array.
+
+    Rows are right-aligned on the newest candle and NaN-padded on the left.
+    Also returns the newest candle time of each ticker (0 if none).
+    """
+    closes = np.full((len(tickers), length), np.nan)
+    latest = np.zeros(len(tickers), dtype=np.int64)
+    for row, ticker in enumerate(tickers):
+        candles = load_candles(ticker, resolution, directory)
+        if len(candles):
+            tail = candles['c'][-length:]
+            closes[row, length - len(tail):] = tail
+            latest[row] = candles['t'][-1]
+    return closes, latest
+
+
+def moving_average(closes, window):
+    """Simple moving average along the last axis, NaN until `window` values exist"""
+    out = np.full(closes.shape, np.nan)
+    if closes.shape[-1] >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(closes, window, axis=-1)
+        out[..., window - 1:] = windows.mean(axis=-1)
+    return out
+
+
+def period_returns(closes, periods):
+    """Return over the last `periods` candles for every row"""
+    if closes.shape[-1] <= periods:
+        return np.full(closes.shape[:-1], np.nan)
+    return closes[..., -1] / closes[..., -1 - periods] - 1
+
+
+def volatility(closes, window, per_year):
+    """Annualized standard deviation of the last `window` log returns"""
+    log_returns = np.diff(np.log(closes[..., -window - 1:]), axis=-1)
+    return np.nanstd(log_returns, axis=-1, ddof=1) * np.sqrt(per_year)
+
+
+def sparklines(closes):
+    """One block-character sparkline per row, scaled to the row's own range"""
+    low = np.nanmin(closes, axis=-1, keepdims=True)
+    high = np.nanmax(closes, axis=-1, keepdims=True)
+    span = np.where(high > low, high - low, 1.0)
+    levels = np.rint((closes - low) / span * (len(SPARK_CHARS) - 2)) + 1
+    levels = np.where(np.isnan(levels), 0, levels).astype(int)
+    return ["".join(row) for row in SPARK_CHARS[levels]]
+
+
+@timed_cache(ttl=300, show_spinner=False)
+def watchlist_trends(resolution='D'):
+    """Price, returns, moving averages, volatility and a sparkline per ticker.
+
+    Computed from the local history only. Tickers without any stored
+    candles are left out.
+    """
+    config = RESOLUTIONS[resolution]
+    pairs = watchlist()
+    tickers = [ticker for _, ticker in pairs]
+    length = max(max(SMA_WINDOWS), max(RETURN_PERIODS) + 1, VOLATILITY_WINDOW + 1, SPARKLINE_WIDTH)
+    closes, latest = close_matrix(tickers, resolution, length)
+
+    # Short histories leave NaNs; those indicators are simply missing
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+        returns = {periods: period_returns(closes, periods) for periods in RETURN_PERIODS}
+        averages = {window: moving_average(closes, window)[:, -1] for window in SMA_WINDOWS}
+        vol = volatility(closes, VOLATILITY_WINDOW, config['per_year'])
+        sparks = sparklines(closes[:, -SPARKLINE_WIDTH:])
+
+    def number(value):
+        return None if np.isnan(value) else float(value)
+
+    trends = []
+    for row, (category, ticker) in enumerate(pairs):
+        if not latest[row]:
+            continue
+        trends.append({
+            'category': category,
+            'ticker': ticker,
+            'price': number(closes[row, -1]),
+            'returns': {periods: number(returns[periods][row]) for periods in RETURN_PERIODS},
+            'sma': {window: number(averages[window][row]) for window in SMA_WINDOWS},
+            'volatility': number(vol[row]),
+            'sparkline': sparks[row],
+            'updated': int(latest[row]),
+        })
+    return trends
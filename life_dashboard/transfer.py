@@ -0,0 +1,220 @@
+"""
+Bulk export and import of mood entries, decisions and ideas
+
+Export streams a table out of Supabase page by page, so the whole table is
+never held in memory:
+
+    python -m life_dashboard.transfer export mood_entries --format csv -o moods.csv
+    python -m life_dashboard.transfer export decisions --format jsonl     # to stdout
+    python -m life_dashboard.transfer export ideas --format parquet -o ideas.parquet
+
+Parquet needs pyarrow (pip install pyarrow).
+
+Import migrates the legacy mood_data.json, decisions.json and ideas.json
+files with chunked multi-row inserts. Rows whose timestamp is already in
+the table are skipped, so running it twice inserts nothing the second time:
+
+    python -m life_dashboard.transfer import --dry-run
+    python -m life_dashboard.transfer import
+"""
+
+import argparse
+import csv
+import json
+import sys
+from contextlib import contextmanager
+from datetime import timezone
+from itertools import islice
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from life_dashboard.config import DECISIONS_FILE, IDEAS_FILE, MOOD_DATA_FILE
+from life_dashboard.db import TABLE_COLUMNS, create_supabase_client, iter_rows, normalize_timestamp, run_query
+
+FORMATS = ['csv', 'jsonl', 'parquet']
+
+# Table -> legacy JSON file imported into it
+LEGACY_FILES = {
+    'mood_entries': MOOD_DATA_FILE,
+    'decisions': DECISIONS_FILE,
+    'ideas': IDEAS_FILE,
+}
+
+
+# ----------------------------------------------------------------------------
+# Export
+# ----------------------------------------------------------------------------
+
+@contextmanager
+def _open_output(path):
+    """path opened for writing text, or stdout for None / '-'"""
+    if path in (None, '-'):
+        yield sys.stdout
+    else:
+        with open(path, 'w', newline='') as f:
+            yield f
+
+
+def write_csv(rows, columns, path):
+    with _open_output(path) as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_jsonl(rows, columns, path):
+    with _open_output(path) as f:
+        count = 0
+        for row in rows:
+            f.write(json.dumps({column: row.get(column) for column in columns}) + "\n")
+            count += 1
+    return count
+
+
+def write_parquet(rows, columns, path, batch_size=1000):
+    """One Parquet row group per batch of rows"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet export needs pyarrow: pip install pyarrow")
+    if path in (None, '-'):
+        raise SystemExit("Parquet export needs an output file (-o)")
+
+    schema = pa.schema([(column, pa.int64() if column == 'id' else pa.string()) for column in columns])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            writer.write_table(pa.Table.from_pylist(
+                [{column: row.get(column) for column in columns} for row in batch], schema=schema
+            ))
+            count += len(batch)
+    return count
+
+
+WRITERS = {'csv': write_csv, 'jsonl': write_jsonl, 'parquet': write_parquet}
+
+
+def export_table(client, table, fmt, path, page_size=1000):
+    """Stream table to path in fmt; returns the number of rows written"""
+    rows = iter_rows(client, table, page_size=page_size)
+    return WRITERS[fmt](rows, TABLE_COLUMNS[table], path)
+
+
+# ----------------------------------------------------------------------------
+# Import
+# ----------------------------------------------------------------------------
+
+def legacy_rows(table, path):
+    """Rows of a legacy JSON file in the table's shape.
+
+    mood_data.json maps dates to lists of {mood, note, timestamp};
+    decisions.json and ideas.json are lists of entries with a 'timestamp'
+    (or 'created_at').
+    """
+    with open(path) as f:
+        data = json.load(f)
+    entries = [entry for day in data.values() for entry in day] if isinstance(data, dict) else data
+
+    text_columns = [column for column in TABLE_COLUMNS[table] if column not in ('id', 'created_at')]
+    for entry in entries:
+        timestamp = entry.get('timestamp') or entry.get('created_at')
+        if not timestamp:
+            continue
+        yield {
+            **{column: entry.get(column) or '' for column in text_columns},
+            'created_at': timestamp,
+        }
+
+
+def import_rows(client, table, rows, chunk_size=500, naive_zone=timezone.utc, dry_run=False):
+    """Insert rows whose timestamp is not in table yet, chunk_size rows per request.
+
+    Returns (inserted, skipped).
+    """
+    existing = {
+        normalize_timestamp(row['created_at'])
+        for row in iter_rows(client, table, columns='created_at')
+        if row.get('created_at')
+    }
+
+    inserted = skipped = 0
+    chunk = []
+
+    def flush():
+        nonlocal inserted
+        if chunk and not dry_run:
+            run_query(client.table(table).insert(chunk))
+        inserted += len(chunk)
+        chunk.clear()
+
+    for row in rows:
+        key = normalize_timestamp(row['created_at'], naive_zone)
+        if key in existing:
+            skipped += 1
+            continue
+        existing.add(key)
+        chunk.append(dict(row, created_at=key))
+        if len(chunk) >= chunk_size:
+            flush()
+    flush()
+    return inserted, skipped
+
+
+# ----------------------------------------------------------------------------
+# Command line
+# ----------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export and import Life Dashboard data")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="Stream a table to CSV, JSONL or Parquet")
+    export.add_argument('table', choices=list(TABLE_COLUMNS))
+    export.add_argument('--format', choices=FORMATS, default='csv', help="Output format (default: csv)")
+    export.add_argument('-o', '--output', help="Output file (default: stdout; required for parquet)")
+    export.add_argument('--page-size', type=int, default=1000, help="Rows per request (default: 1000)")
+
+    imp = commands.add_parser('import', help="Import the legacy JSON files")
+    for table, filename in LEGACY_FILES.items():
+        imp.add_argument(f"--{table.replace('_', '-')}-file", dest=table, default=filename,
+                         help=f"Legacy {table} file (default: {filename})")
+    imp.add_argument('--chunk-size', type=int, default=500, help="Rows per insert (default: 500)")
+    imp.add_argument('--naive-timezone', default='UTC',
+                     help="Zone of timestamps without an offset (default: UTC)")
+    imp.add_argument('--dry-run', action='store_true', help="Report what would be inserted")
+
+    args = parser.parse_args(argv)
+
+    client = create_supabase_client()
+    if client is None:
+        raise SystemExit("Supabase is not configured (SUPABASE_URL / SUPABASE_ANON_KEY)")
+
+    if args.command == 'export':
+        count = export_table(client, args.table, args.format, args.output, args.page_size)
+        print(f"Exported {count} {args.table} rows", file=sys.stderr)
+        return
+
+    naive_zone = ZoneInfo(args.naive_timezone)
+    for table in LEGACY_FILES:
+        path = Path(getattr(args, table))
+        if not path.exists():
+            print(f"{table}: {path} not found, skipped")
+            continue
+        inserted, skipped = import_rows(
+            client, table, legacy_rows(table, path), args.chunk_size, naive_zone, args.dry_run
+        )
+        verb = "would insert" if args.dry_run else "inserted"
+        print(f"{table}: {verb} {inserted}, skipped {skipped} already present")
+
+
+if __name__ == '__main__':
+    main()